@@ -1,9 +1,22 @@
 from flask import Flask
+from pymongo.errors import PyMongoError
+from pokedex_app.app import commands
 from pokedex_app.app.models.mongodb import mongo
+from pokedex_app.app.models.indexes import check_query_shapes
+from pokedex_app.app.models.snapshot import snapshot
+from pokedex_app.app.models.team_store import team_store
+from pokedex_app.app.utils.type_chart import type_chart
+from pokedex_app.app.utils.cache import tiered_cache
+from pokedex_app.app.utils.code_version import code_version
+from pokedex_app.app.utils.instrumentation import instrumentation
+from pokedex_app.app.utils.metrics import metrics
+from pokedex_app.app.utils.page_cache import fragment
+from pokedex_app.app.utils.compression import compression
 from flask_caching import Cache
 from flask_cors import CORS
 import os
 import sys
+import time
 
 # Add parent directory to sys.path to make imports work
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -24,16 +37,37 @@ def create_app(config_class=None):
         app.config.from_object('pokedex_app.config.Config')
     else:
         app.config.from_object(config_class)
+    if not app.config.get('HTTP_CACHE_SALT'):
+        app.config['HTTP_CACHE_SALT'] = code_version(app.root_path)
+    if not app.config.get('HTTP_CACHE_DEPLOYED_AT'):
+        app.config['HTTP_CACHE_DEPLOYED_AT'] = time.time()
     
-    # Initialize extensions
-    mongo.init_app(app)
+    # Initialize extensions; instrumentation and metrics come first so their
+    # Mongo listeners are registered on the client and they time the whole request
+    instrumentation.init_app(app)
+    metrics.init_app(app)
+    mongo.init_app(app, event_listeners=instrumentation.listeners() + metrics.listeners())
+    snapshot.init_app(app)
+    team_store.init_app(app)
+    type_chart.init_app(app)
     cache.init_app(app)
+    tiered_cache.init_app(app, cache)
+    compression.init_app(app, tiered_cache)
     CORS(app)
+    commands.init_app(app)
+    
+    # Flag registered query shapes that no index covers
+    if app.config.get('INDEX_CHECK_ON_STARTUP'):
+        try:
+            check_query_shapes(mongo.db)
+        except PyMongoError as e:
+            app.logger.warning("Could not check query plans: %s", e)
     
     # Add built-in functions to Jinja environment
     app.jinja_env.globals.update(
         max=max,
-        min=min
+        min=min,
+        fragment=fragment
     )
     
     # Register blueprints
@@ -0,0 +1,71 @@
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+
+from pokedex_app.app.models.mongodb import mongo
+from pokedex_app.app.models.indexes import ensure_indexes, find_collection_scans
+from pokedex_app.app.services.warmup import warm_up, format_report
+from pokedex_app.app.services.static_export import DatasetChangedError, export_site
+
+indexes_cli = AppGroup('indexes', help='Manage MongoDB indexes.')
+cache_cli = AppGroup('cache', help='Manage the response and service caches.')
+
+
+@indexes_cli.command('create')
+@click.argument('collections', nargs=-1)
+def create_indexes(collections):
+    """Create the indexes in models/indexes.py (all collections by default)."""
+    created = ensure_indexes(mongo.db, list(collections) or None)
+    for name, index_names in created.items():
+        click.echo(f"{name}: {', '.join(index_names)}")
+
+
+@indexes_cli.command('check')
+def check_indexes():
+    """Explain every registered query shape and report collection scans."""
+    scans = find_collection_scans(mongo.db)
+    for collection, query, sort in scans:
+        click.echo(f"COLLSCAN: {collection} filter={query} sort={sort}")
+    if scans:
+        raise SystemExit(1)
+    click.echo("All registered query shapes use an index")
+
+
+@cache_cli.command('warm')
+@click.option('--workers', default=8, show_default=True, help='Concurrent requests.')
+@with_appcontext
+def warm_cache(workers):
+    """Request every cached page once to fill the page and fragment caches."""
+    report = warm_up(current_app._get_current_object(), workers=workers)
+    for line in format_report(report):
+        click.echo(line)
+    if report['errors']:
+        raise SystemExit(1)
+
+
+@click.command('export')
+@click.argument('output_dir', default='export')
+@click.option('--processes', default=os.cpu_count() or 1, show_default=True, help='Worker processes.')
+@click.option('--full', is_flag=True, help='Re-export every page, not only changed ones.')
+@with_appcontext
+def export_static(output_dir, processes, full):
+    """Render every dataset page and API document to static files."""
+    try:
+        report = export_site(current_app._get_current_object(), output_dir, processes=processes, full=full)
+    except DatasetChangedError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{report['rendered']} pages rendered, {report['unchanged']} unchanged, "
+               f"{report['deleted']} deleted, {report['bytes']} bytes written in {report['seconds']}s")
+    for url, status in report['errors'][:20]:
+        click.echo(f"  {status} {url}")
+    if report['errors']:
+        raise SystemExit(1)
+
+
+def init_app(app):
+    """Register the app's CLI commands."""
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(export_static)
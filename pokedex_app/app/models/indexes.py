@@ -0,0 +1,108 @@
+import logging
+
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Every index the app relies on, per collection. Applied by
+# scripts/import_data.py and by `flask indexes create`. Pages and the API
+# read the dataset from the in-memory snapshot (models/snapshot.py), so
+# dataset collections only need the key the importer upserts by.
+INDEXES = {
+    'pokemon': [
+        IndexModel([('id', ASCENDING)], unique=True)
+    ],
+    'moves': [
+        IndexModel([('id', ASCENDING)], unique=True)
+    ],
+    'items': [
+        IndexModel([('id', ASCENDING)], unique=True)
+    ],
+    'types': [
+        IndexModel([('english', ASCENDING)], unique=True)
+    ],
+    'generations': [
+        IndexModel([('id', ASCENDING)], unique=True)
+    ],
+    'teams': [
+        IndexModel([('owner', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+    ]
+}
+
+# Query shapes the app issues against MongoDB, as
+# (collection, filter, sort). Each must be answered by an index. Requests
+# read the dataset from the snapshot, so only the snapshot, the team store
+# and the importer query Mongo. Snapshot loads (a full find of each dataset
+# collection) and the importer's reads of every key and hash read whole
+# collections on purpose and aren't listed.
+QUERY_SHAPES = [
+    # Dataset version check before every snapshot refresh
+    ('meta', {'_id': 'dataset'}, None),
+    # Importer upserts and deletes, by each collection's key
+    ('pokemon', {'id': 1}, None),
+    ('moves', {'id': 1}, None),
+    ('items', {'id': 1}, None),
+    ('types', {'english': 'Fire'}, None),
+    ('generations', {'id': 1}, None),
+    # Saved teams
+    ('teams', {'_id': ObjectId()}, None),
+    ('teams', {'_id': {'$in': [ObjectId()]}}, None),
+    ('teams', {'owner': 'owner'}, [('created_at', DESCENDING), ('_id', DESCENDING)])
+]
+
+
+def ensure_indexes(db, collections=None):
+    """
+    Create the manifest indexes; indexes that already exist are left alone.
+
+    Args:
+        db: pymongo Database
+        collections (list): Collection names to index, all by default
+
+    Returns:
+        dict: Collection name -> names of its manifest indexes
+    """
+    created = {}
+    for name, models in INDEXES.items():
+        if collections is None or name in collections:
+            created[name] = db[name].create_indexes(models)
+    return created
+
+
+def _stages(plan):
+    """Yield every stage name in an explain plan tree."""
+    yield plan.get('stage')
+    for key in ('inputStage', 'queryPlan'):
+        if isinstance(plan.get(key), dict):
+            yield from _stages(plan[key])
+    for child in plan.get('inputStages', []):
+        yield from _stages(child)
+
+
+def find_collection_scans(db):
+    """
+    Explain every registered query shape and return those that scan a whole collection.
+
+    Returns:
+        list: (collection, filter, sort) shapes whose winning plan has a COLLSCAN
+    """
+    scans = []
+    for collection, query, sort in QUERY_SHAPES:
+        command = {'find': collection, 'filter': query}
+        if sort:
+            command['sort'] = dict(sort)
+        explain = db.command('explain', command, verbosity='queryPlanner')
+        winning_plan = explain['queryPlanner']['winningPlan']
+        if 'COLLSCAN' in _stages(winning_plan):
+            scans.append((collection, query, sort))
+    return scans
+
+
+def check_query_shapes(db):
+    """Log a warning for every registered query shape that does a COLLSCAN."""
+    scans = find_collection_scans(db)
+    for collection, query, sort in scans:
+        logger.warning("Query on %s with filter %s and sort %s does a COLLSCAN; "
+                       "run `flask indexes create`", collection, query, sort)
+    return scans
@@ -8,10 +8,10 @@ class MongoDB:
         if app is not None:
             self.init_app(app)
     
-    def init_app(self, app):
+    def init_app(self, app, event_listeners=None):
         mongo_uri = app.config.get('MONGO_URI')
         db_name = app.config.get('MONGO_DB_NAME')
-        self.client = MongoClient(mongo_uri)
+        self.client = MongoClient(mongo_uri, event_listeners=event_listeners or [])
         self.db = self.client[db_name]
     
     def get_collection(self, collection_name):
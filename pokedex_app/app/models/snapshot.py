@@ -0,0 +1,381 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from pymongo.errors import PyMongoError
+from pokedex_app.app.models.mongodb import mongo
+from pokedex_app.app.utils.evolution import build_evolution_families
+from pokedex_app.app.utils.learnset import build_learnset
+from pokedex_app.app.utils.search_index import NameSearchIndex, normalize
+from pokedex_app.app.utils.fuzzy import FuzzyNameIndex
+from pokedex_app.app.utils.normalize import normalize_pokemon, normalize_move, normalize_item
+
+logger = logging.getLogger(__name__)
+
+# Document in the 'meta' collection that carries the dataset version.
+# scripts/import_data.py bumps it after every import that changed data.
+DATASET_META_ID = 'dataset'
+
+# Import bookkeeping fields left out of snapshot records
+RECORD_PROJECTION = {'_id': 0, '_hash': 0}
+
+NAME_LANGUAGES = ('english', 'japanese', 'chinese', 'french')
+
+# Number of distinct filter signatures whose results are kept per snapshot
+FILTER_CACHE_SIZE = 256
+
+# Pokémon shown per generation on the home page
+SHOWCASE_SIZE = 8
+
+
+def get_dataset_meta():
+    """Read the dataset version document from MongoDB."""
+    meta = mongo.get_collection('meta').find_one({'_id': DATASET_META_ID}) or {}
+    return {
+        'version': meta.get('version', 0),
+        'updated_at': meta.get('updated_at')
+    }
+
+
+def item_name(item):
+    """Return the English name of an item; a few items store it as a plain string."""
+    name = item.get('name') or ''
+    return name.get('english', '') if isinstance(name, dict) else name
+
+
+class SnapshotData:
+    """
+    Records and indexes for a single dataset version.
+
+    Instances are built once and never modified afterwards, so they can be
+    shared between request threads without locking; the lazily built
+    learnsets, filter results and fuzzy index each have their own lock. Records are shared
+    too: callers must copy a record before mutating it.
+    """
+
+    def __init__(self, version, pokemon, moves, types, items, updated_at=None):
+        self.version = version
+        self.updated_at = updated_at
+
+        self.pokemon = sorted(pokemon, key=lambda p: p['id'])
+        self.moves = sorted(moves, key=lambda m: m['id'])
+        self.types = list(types)
+        self.items = sorted(items, key=lambda i: i['id'])
+
+        # Primary indexes
+        self.pokemon_by_id = {p['id']: p for p in self.pokemon}
+        self.moves_by_id = {m['id']: m for m in self.moves}
+        self.types_by_name = {t['english']: t for t in self.types}
+        self.items_by_id = {i['id']: i for i in self.items}
+
+        # Secondary indexes, each list kept in id order
+        self.pokemon_by_generation = {}
+        self.pokemon_by_type = {}
+        self.pokemon_by_name = {}
+        for pokemon in self.pokemon:
+            self.pokemon_by_generation.setdefault(pokemon.get('generation'), []).append(pokemon)
+            for type_name in pokemon.get('type', []):
+                self.pokemon_by_type.setdefault(type_name, []).append(pokemon)
+            for language in NAME_LANGUAGES:
+                name = pokemon.get('name', {}).get(language)
+                if name:
+                    self.pokemon_by_name.setdefault(normalize(name), pokemon)
+
+        # First SHOWCASE_SIZE Pokémon of each generation, in generation order, for the home page
+        self.generation_showcase = {
+            generation: self.pokemon_by_generation[generation][:SHOWCASE_SIZE]
+            for generation in sorted(g for g in self.pokemon_by_generation if g is not None)
+        }
+
+        self.evolution_families = build_evolution_families(self.pokemon_by_id)
+        self.search_index = NameSearchIndex(self.pokemon)
+
+        self.moves_by_type = {}
+        for move in self.moves:
+            self.moves_by_type.setdefault(move.get('type'), []).append(move)
+
+        self.item_categories = sorted({i['category'] for i in self.items if i.get('category')})
+
+        # Built lazily, one entry per Pokémon
+        self.learnsets = {}
+        self._learnset_lock = threading.Lock()
+
+        # Filter results keyed by filter signature, built lazily
+        self.filter_results = OrderedDict()
+        self._filter_lock = threading.Lock()
+
+        # Typo-tolerant name index, built on first use (reload() builds it
+        # before the snapshot is served)
+        self._fuzzy_index = None
+        self._fuzzy_lock = threading.Lock()
+
+    def fuzzy_index(self):
+        """Return the fuzzy name index, building it on first use."""
+        if self._fuzzy_index is None:
+            with self._fuzzy_lock:
+                if self._fuzzy_index is None:
+                    self._fuzzy_index = FuzzyNameIndex(self.pokemon, self.moves, self.items)
+        return self._fuzzy_index
+
+    def filtered(self, signature, build):
+        """
+        Return the memoized result of build(self) for a filter signature.
+
+        Results are kept for the most recent FILTER_CACHE_SIZE signatures,
+        so repeated pages of the same filter (and their total counts) never
+        rescan the records.
+        """
+        with self._filter_lock:
+            result = self.filter_results.get(signature)
+            if result is not None:
+                self.filter_results.move_to_end(signature)
+                return result
+
+        result = build(self)
+        with self._filter_lock:
+            self.filter_results[signature] = result
+            while len(self.filter_results) > FILTER_CACHE_SIZE:
+                self.filter_results.popitem(last=False)
+        return result
+
+    def learnset(self, pokemon_id):
+        """Return the memoized learnset of a Pokémon, or None if it doesn't exist."""
+        learnset = self.learnsets.get(pokemon_id)
+        if learnset is None:
+            pokemon = self.pokemon_by_id.get(pokemon_id)
+            if not pokemon:
+                return None
+            with self._learnset_lock:
+                # Another thread may have built it while this one waited
+                learnset = self.learnsets.get(pokemon_id)
+                if learnset is None:
+                    learnset = build_learnset(pokemon, self.moves, self.moves_by_type)
+                    self.learnsets[pokemon_id] = learnset
+        return learnset
+
+
+class PokedexSnapshot:
+    """
+    In-process, read-only copy of the pokemon, moves, types and items
+    collections.
+
+    The snapshot is loaded once when the app is created. Every request
+    checks (at most once per SNAPSHOT_REFRESH_INTERVAL seconds) whether the
+    import script has bumped the dataset version, and if so the whole
+    snapshot is rebuilt and swapped in as a single reference assignment.
+    """
+
+    def __init__(self, app=None):
+        self._data = SnapshotData(0, [], [], [], [])
+        self._loaded = False
+        self._reload_lock = threading.Lock()
+        self._refresh_interval = 30
+        self._last_check = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._refresh_interval = app.config.get('SNAPSHOT_REFRESH_INTERVAL', 30)
+        app.extensions['snapshot'] = self
+
+        try:
+            self.reload()
+        except PyMongoError as e:
+            # Keep serving; the next request will retry the load
+            logger.warning("Could not load Pokédex snapshot: %s", e)
+
+        app.before_request(self.refresh_if_stale)
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def version(self):
+        return self._data.version
+
+    @property
+    def updated_at(self):
+        return self._data.updated_at
+
+    def reload(self):
+        """Load every collection from MongoDB and swap in the new snapshot."""
+        with self._reload_lock:
+            meta = get_dataset_meta()
+            # Records are normalized by the importer; doing it again is a
+            # no-op, and covers data imported by older versions of it
+            data = SnapshotData(
+                meta['version'],
+                [normalize_pokemon(p) for p in mongo.get_collection('pokemon').find({}, RECORD_PROJECTION)],
+                [normalize_move(m) for m in mongo.get_collection('moves').find({}, RECORD_PROJECTION)],
+                list(mongo.get_collection('types').find({}, RECORD_PROJECTION)),
+                [normalize_item(i) for i in mongo.get_collection('items').find({}, RECORD_PROJECTION)],
+                updated_at=meta['updated_at']
+            )
+            # Build the fuzzy index before swapping in, so no request pays for it
+            data.fuzzy_index()
+            self._data = data
+            self._loaded = True
+            self._last_check = time.monotonic()
+            logger.info("Loaded Pokédex snapshot version %s (%d Pokémon)",
+                        data.version, len(data.pokemon))
+        return data
+
+    def refresh_if_stale(self):
+        """Reload the snapshot if the dataset version has changed."""
+        now = time.monotonic()
+        if self._loaded and now - self._last_check < self._refresh_interval:
+            return
+        if self._reload_lock.locked():
+            # Another thread is already reloading; keep serving the old data
+            return
+        self._last_check = now
+
+        try:
+            if not self._loaded or get_dataset_meta()['version'] != self._data.version:
+                self.reload()
+        except PyMongoError as e:
+            logger.warning("Could not refresh Pokédex snapshot: %s", e)
+
+    # Pokémon
+
+    def get_pokemon(self, pokemon_id):
+        return self._data.pokemon_by_id.get(pokemon_id)
+
+    def get_pokemon_by_name(self, name):
+        return self._data.pokemon_by_name.get(normalize(name))
+
+    def all_pokemon(self):
+        return self._data.pokemon
+
+    def pokemon_by_generation(self, generation):
+        return self._data.pokemon_by_generation.get(generation, [])
+
+    def generation_showcase(self):
+        """Return {generation: [first SHOWCASE_SIZE Pokémon]} for the home page."""
+        return self._data.generation_showcase
+
+    def pokemon_by_type(self, type_name):
+        return self._data.pokemon_by_type.get(type_name, [])
+
+    def get_evolution_family(self, pokemon_id):
+        """Return the evolution family of a Pokémon, or None if it doesn't evolve."""
+        return self._data.evolution_families.get(pokemon_id)
+
+    def search_pokemon(self, query, limit=10):
+        """Search Pokémon names in every language, best match first."""
+        data = self._data
+        return [data.pokemon_by_id[pokemon_id] for pokemon_id in data.search_index.search(query, limit)]
+
+    def fuzzy_search(self, query, limit=10):
+        """
+        Find Pokémon, moves and items whose name is within a few edits of a query.
+
+        Returns:
+            list: (distance, kind, record) tuples, closest first
+        """
+        data = self._data
+        records = {'pokemon': data.pokemon_by_id, 'move': data.moves_by_id, 'item': data.items_by_id}
+        return [
+            (distance, kind, records[kind][record_id])
+            for distance, kind, record_id in data.fuzzy_index().search(query, limit)
+        ]
+
+    def get_learnset(self, pokemon_id):
+        """Return the learnset of a Pokémon for the current dataset version."""
+        return self._data.learnset(pokemon_id)
+
+    def find_pokemon(self, generation=None, type_name=None, query=''):
+        """
+        Filter Pokémon the same way the list views used to query MongoDB.
+
+        Args:
+            generation (int): Only include this generation
+            type_name (str): Only include Pokémon with this type
+            query (str): Case-insensitive English name match, or exact ID
+
+        Returns:
+            list: Matching Pokémon records in ID order
+        """
+        return self._data.filtered(
+            ('pokemon', generation, type_name, query),
+            lambda data: self._filter_pokemon(data, generation, type_name, query)
+        )
+
+    @staticmethod
+    def _filter_pokemon(data, generation, type_name, query):
+        if generation is not None:
+            candidates = data.pokemon_by_generation.get(generation, [])
+        elif type_name:
+            candidates = data.pokemon_by_type.get(type_name, [])
+        else:
+            candidates = data.pokemon
+
+        if generation is not None and type_name:
+            candidates = [p for p in candidates if type_name in p.get('type', [])]
+
+        if query:
+            needle = query.lower()
+            query_id = int(query) if query.isdigit() else None
+            candidates = [
+                p for p in candidates
+                if p['id'] == query_id or needle in p['name_lower'].get('english', '')
+            ]
+
+        return candidates
+
+    # Moves, types and items
+
+    def get_move(self, move_id):
+        return self._data.moves_by_id.get(move_id)
+
+    def find_moves(self, type_name=None, query='', category=None):
+        """Filter moves by type, category and a case-insensitive English name match."""
+        return self._data.filtered(
+            ('moves', type_name, query, category),
+            lambda data: self._filter_moves(data, type_name, query, category)
+        )
+
+    @staticmethod
+    def _filter_moves(data, type_name, query, category):
+        candidates = data.moves_by_type.get(type_name, []) if type_name else data.moves
+        if category:
+            candidates = [m for m in candidates if m['category'] == category]
+        if query:
+            needle = query.lower()
+            candidates = [m for m in candidates if needle in m['name_lower'].get('english', '')]
+        return candidates
+
+    def get_type(self, type_name):
+        return self._data.types_by_name.get(type_name)
+
+    def types(self):
+        return self._data.types
+
+    def get_item(self, item_id):
+        return self._data.items_by_id.get(item_id)
+
+    def find_items(self, category=None, query=''):
+        """Filter items by category and a case-insensitive English name match."""
+        return self._data.filtered(
+            ('items', category, query),
+            lambda data: self._filter_items(data, category, query)
+        )
+
+    @staticmethod
+    def _filter_items(data, category, query):
+        candidates = data.items
+        if category:
+            candidates = [i for i in candidates if i.get('category') == category]
+        if query:
+            needle = query.lower()
+            candidates = [i for i in candidates if needle in i['name_lower'].get('english', '')]
+        return candidates
+
+    def item_categories(self):
+        return self._data.item_categories
+
+
+# Create a global instance
+snapshot = PokedexSnapshot()
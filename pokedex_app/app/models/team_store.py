@@ -0,0 +1,162 @@
+import base64
+import threading
+from datetime import datetime, timezone
+
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+
+from pokedex_app.app.models.indexes import ensure_indexes
+from pokedex_app.app.models.mongodb import mongo
+
+# Fields returned by list views; full member lists are only read on load
+SUMMARY_PROJECTION = {'name': 1, 'size': 1, 'pokemon_ids': 1, 'created_at': 1}
+
+# List pages are sorted newest first, with _id breaking ties
+LIST_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
+
+
+def _encode_cursor(team):
+    """Encode the sort key of the last team on a page as an opaque cursor."""
+    millis = int(team['created_at'].replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return base64.urlsafe_b64encode(f"team:{millis}:{team['_id']}".encode('ascii')).rstrip(b'=').decode('ascii')
+
+
+def _decode_cursor(cursor):
+    """
+    Decode a cursor created by _encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, millis, team_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii').split(':')
+        if prefix != 'team':
+            raise ValueError('Invalid cursor')
+        created_at = datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc)
+        return created_at, ObjectId(team_id)
+    except (ValueError, UnicodeError, InvalidId):
+        raise ValueError('Invalid cursor')
+
+
+def _parse_id(team_id):
+    try:
+        return ObjectId(team_id)
+    except (InvalidId, TypeError):
+        return None
+
+
+class TeamStore:
+    """
+    Saved teams in the 'teams' collection.
+
+    Teams are stored with their owner, creation time and compact member
+    references, plus the summary fields list views need ('size' and
+    'pokemon_ids'). Listing is keyset-paginated on the
+    (owner, created_at, _id) index, so every page costs the same however
+    many teams are saved.
+    """
+
+    def __init__(self, app=None):
+        self._indexes_ready = False
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['team_store'] = self
+
+    @property
+    def collection(self):
+        """The teams collection, with its indexes (see models/indexes.py) created on first use."""
+        if not self._indexes_ready:
+            with self._lock:
+                if not self._indexes_ready:
+                    ensure_indexes(mongo.db, ['teams'])
+                    self._indexes_ready = True
+        return mongo.get_collection('teams')
+
+    @staticmethod
+    def build_document(owner, team, now=None):
+        """Return the document stored for a team of compact member references."""
+        now = now or datetime.now(timezone.utc)
+        members = team.get('pokemon', [])
+        return {
+            'owner': owner,
+            'name': team.get('name', 'My Team'),
+            'pokemon': members,
+            'pokemon_ids': [member['id'] for member in members],
+            'size': len(members),
+            'created_at': now,
+            'updated_at': now
+        }
+
+    def save(self, owner, team):
+        """Save a team and return its ID as a string."""
+        result = self.collection.insert_one(self.build_document(owner, team))
+        return str(result.inserted_id)
+
+    def save_many(self, owner, teams):
+        """Save several teams in one round trip and return their IDs, in order."""
+        if not teams:
+            return []
+        now = datetime.now(timezone.utc)
+        documents = [self.build_document(owner, team, now) for team in teams]
+        result = self.collection.insert_many(documents)
+        return [str(team_id) for team_id in result.inserted_ids]
+
+    def load(self, team_id):
+        """Return a saved team, or None if the ID is invalid or unknown."""
+        object_id = _parse_id(team_id)
+        if object_id is None:
+            return None
+        return self.collection.find_one({'_id': object_id})
+
+    def load_many(self, team_ids):
+        """
+        Return saved teams by ID in one query.
+
+        Returns:
+            tuple: (teams in the requested order, IDs that weren't found)
+        """
+        object_ids = [_parse_id(team_id) for team_id in team_ids]
+        found = {
+            str(team['_id']): team
+            for team in self.collection.find({'_id': {'$in': [i for i in object_ids if i is not None]}})
+        }
+        teams = [found[str(team_id)] for team_id in team_ids if str(team_id) in found]
+        missing = [team_id for team_id in team_ids if str(team_id) not in found]
+        return teams, missing
+
+    def list_summaries(self, owner, limit=20, after=None):
+        """
+        Return one page of an owner's teams, newest first, as summary documents.
+
+        Args:
+            owner (str): Owner ID
+            limit (int): Page size
+            after (str): Cursor from a previous page
+
+        Returns:
+            tuple: (summary documents, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = {'owner': owner}
+        if after:
+            created_at, last_id = _decode_cursor(after)
+            query['$or'] = [
+                {'created_at': {'$lt': created_at}},
+                {'created_at': created_at, '_id': {'$lt': last_id}}
+            ]
+
+        # Fetch one extra team to know whether there's a next page
+        teams = list(self.collection.find(query, SUMMARY_PROJECTION).sort(LIST_SORT).limit(limit + 1))
+        next_cursor = _encode_cursor(teams[limit - 1]) if len(teams) > limit else None
+        return teams[:limit], next_cursor
+
+
+# Create a global instance
+team_store = TeamStore()
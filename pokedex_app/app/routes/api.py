@@ -1,157 +1,235 @@
-from flask import Blueprint, jsonify, request, render_template
-from pokedex_app.app.models.mongodb import mongo
+from flask import Blueprint, request, render_template, current_app
+from pokedex_app.app.models.snapshot import snapshot
 from pokedex_app.app.utils.helpers import calculate_type_effectiveness
 from pokedex_app.app.services.theme_service import get_generation_theme
-from flask_caching import Cache
-from bson import json_util
-import json
+from pokedex_app.app.utils.cache import tiered_cache
+from pokedex_app.app.utils.http_cache import conditional
+from pokedex_app.app.utils.instrumentation import instrumentation
+from pokedex_app.app.utils.pagination import paginate
+from pokedex_app.app.utils.serialization import json_response
+from pokedex_app.app.utils.projection import parse_fields, project, wants
+from pokedex_app.app.utils.team_analysis import analyze_teams
 
 api_bp = Blueprint('api', __name__)
 
-# Helper function to convert MongoDB BSON to JSON
-def parse_json(data):
-    return json.loads(json_util.dumps(data))
+# Default page sizes of the list endpoints, and the largest they accept
+POKEMON_PER_PAGE = 20
+MOVES_PER_PAGE = 50
+MAX_LIMIT = 100
+
+def page_args(default_limit):
+    """
+    Read the page number and page size of a list endpoint.
+    
+    Missing or non-numeric values fall back to the defaults; the page is at
+    least 1 and the size between 1 and MAX_LIMIT.
+    
+    Returns:
+        tuple: (page, limit)
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', default_limit, type=int), 1), MAX_LIMIT)
+    return page, limit
 
 @api_bp.route('/pokemon')
+@conditional
 def get_pokemon_list():
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('limit', 20))
-    skip = (page - 1) * per_page
+    page, per_page = page_args(POKEMON_PER_PAGE)
+    after = request.args.get('after')
+    fields = parse_fields(request.args.get('fields'))
     
     # Get filters
     generation = request.args.get('generation')
     type_filter = request.args.get('type')
     query = request.args.get('q', '')
     
-    # Build MongoDB query
-    mongo_query = {}
-    
-    if generation:
-        try:
-            mongo_query['generation'] = int(generation)
-        except ValueError:
-            pass
+    try:
+        generation = int(generation) if generation else None
+    except ValueError:
+        generation = None
     
-    if type_filter:
-        mongo_query['type'] = type_filter
+    # Get Pokémon data
+    matches = snapshot.find_pokemon(generation=generation, type_name=type_filter, query=query)
     
-    if query:
-        mongo_query['$or'] = [
-            {'name.english': {'$regex': query, '$options': 'i'}},
-            {'id': int(query)} if query.isdigit() else {'name.english': {'$regex': query, '$options': 'i'}}
-        ]
+    # Page by cursor when 'after' is given, otherwise by page number
+    try:
+        pokemon_list, pagination = paginate(matches, per_page, page=page, after=after)
+    except ValueError:
+        return json_response({'error': 'Invalid cursor'}, 400)
     
-    # Get Pokémon data
-    total = mongo.get_collection('pokemon').count_documents(mongo_query)
-    pokemon_list = list(mongo.get_collection('pokemon')
-                       .find(mongo_query)
-                       .sort('id', 1)
-                       .skip(skip)
-                       .limit(per_page))
-    
-    # Calculate pagination
-    total_pages = (total + per_page - 1) // per_page
-    
-    return jsonify({
-        'pokemon': parse_json(pokemon_list),
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': total,
-            'total_pages': total_pages
-        }
+    return json_response({
+        'pokemon': [project(pokemon, fields) for pokemon in pokemon_list],
+        'pagination': pagination
     })
 
 @api_bp.route('/pokemon/<int:pokemon_id>')
+@conditional
 def get_pokemon(pokemon_id):
-    pokemon = mongo.get_collection('pokemon').find_one({'id': pokemon_id})
+    pokemon = snapshot.get_pokemon(pokemon_id)
     
     if not pokemon:
-        return jsonify({'error': 'Pokemon not found'}), 404
+        return json_response({'error': 'Pokemon not found'}, 404)
     
-    # Get type effectiveness
-    type_effectiveness = calculate_type_effectiveness(pokemon['type'])
+    fields = parse_fields(request.args.get('fields'))
+    pokemon_data = project(pokemon, fields)
     
-    # Add type effectiveness to response
-    pokemon_data = parse_json(pokemon)
-    pokemon_data['type_effectiveness'] = type_effectiveness
+    # Add type effectiveness to response unless other fields were requested
+    if wants(fields, 'type_effectiveness'):
+        pokemon_data = dict(pokemon_data)
+        pokemon_data['type_effectiveness'] = calculate_type_effectiveness(pokemon['type'])
     
-    return jsonify(pokemon_data)
+    return json_response(pokemon_data)
+
+@api_bp.route('/pokemon/batch', methods=['GET', 'POST'])
+def get_pokemon_batch():
+    """
+    Get many Pokémon in one request.
+    
+    IDs come from ?ids=1,2,3 (or repeated ids= parameters) on GET, or from a
+    {"ids": [...]} JSON body on POST. Results keep the requested order.
+    """
+    fields = parse_fields(request.args.get('fields'))
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return json_response({'error': 'Body must be a JSON object like {"ids": [1, 2, 3]}'}, 400)
+        pokemon_ids = body.get('ids', [])
+        # bool is a subclass of int, but true/false aren't IDs
+        if (not isinstance(pokemon_ids, list)
+                or not all(isinstance(pokemon_id, int) and not isinstance(pokemon_id, bool)
+                           for pokemon_id in pokemon_ids)):
+            return json_response({'error': 'ids must be a list of integers'}, 400)
+        if body.get('fields'):
+            if not isinstance(body['fields'], str):
+                return json_response({'error': 'fields must be a comma-separated string'}, 400)
+            fields = parse_fields(body['fields'])
+    else:
+        raw_ids = [part.strip() for value in request.args.getlist('ids') for part in value.split(',')]
+        try:
+            pokemon_ids = [int(pokemon_id) for pokemon_id in raw_ids if pokemon_id]
+        except ValueError:
+            return json_response({'error': 'ids must be integers'}, 400)
+    
+    if not pokemon_ids:
+        return json_response({'error': 'No ids given'}, 400)
+    
+    max_ids = current_app.config.get('API_BATCH_MAX_IDS', 500)
+    if len(pokemon_ids) > max_ids:
+        return json_response({'error': f'At most {max_ids} ids per request'}, 400)
+    
+    # Type effectiveness is computed once per distinct type combination
+    effectiveness_by_types = {}
+    pokemon_list = []
+    missing = []
+    for pokemon_id in pokemon_ids:
+        pokemon = snapshot.get_pokemon(pokemon_id)
+        if not pokemon:
+            missing.append(pokemon_id)
+            continue
+        
+        pokemon_data = project(pokemon, fields)
+        if wants(fields, 'type_effectiveness'):
+            types_key = tuple(sorted(pokemon['type']))
+            if types_key not in effectiveness_by_types:
+                effectiveness_by_types[types_key] = calculate_type_effectiveness(pokemon['type'])
+            
+            pokemon_data = dict(pokemon_data)
+            pokemon_data['type_effectiveness'] = effectiveness_by_types[types_key]
+        pokemon_list.append(pokemon_data)
+    
+    return json_response({
+        'pokemon': pokemon_list,
+        'missing': missing
+    })
 
 @api_bp.route('/types')
+@conditional
 def get_types():
-    types = list(mongo.get_collection('types').find())
-    return jsonify(parse_json(types))
+    return json_response(snapshot.types())
 
 @api_bp.route('/moves')
+@conditional
 def get_moves():
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('limit', 50))
-    skip = (page - 1) * per_page
+    page, per_page = page_args(MOVES_PER_PAGE)
+    after = request.args.get('after')
     
     # Get filters
     type_filter = request.args.get('type')
     query = request.args.get('q', '')
     
-    # Build MongoDB query
-    mongo_query = {}
-    
-    if type_filter:
-        mongo_query['type'] = type_filter
-    
-    if query:
-        mongo_query['ename'] = {'$regex': query, '$options': 'i'}
-    
     # Get moves data
-    total = mongo.get_collection('moves').count_documents(mongo_query)
-    moves_data = list(mongo.get_collection('moves')
-                     .find(mongo_query)
-                     .sort('id', 1)
-                     .skip(skip)
-                     .limit(per_page))
-    
-    # Map category names to English
-    category_map = {
-        "物理": "physical",
-        "特殊": "special", 
-        "变化": "status"
-    }
+    matches = snapshot.find_moves(type_name=type_filter, query=query)
+    
+    # Page by cursor when 'after' is given, otherwise by page number
+    try:
+        moves_data, pagination = paginate(matches, per_page, page=page, after=after)
+    except ValueError:
+        return json_response({'error': 'Invalid cursor'}, 400)
     
     # Transform moves data
     formatted_moves = []
     for move in moves_data:
-        # Map the Japanese category to English
-        eng_category = category_map.get(move.get('category', ''), 'status')
-        
         # Create properly structured move data
         formatted_move = {
             'id': move.get('id', 0),
             'name': move.get('ename', 'Unknown'),
             'type': move.get('type', 'Normal'),
-            'category': eng_category,
+            'category': move['category'],
             'power': move.get('power', None),
             'accuracy': move.get('accuracy', None),
             'pp': move.get('pp', 0),
         }
         formatted_moves.append(formatted_move)
     
-    # Calculate pagination
-    total_pages = (total + per_page - 1) // per_page
-    
-    return jsonify({
+    return json_response({
         'moves': formatted_moves,
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': total,
-            'total_pages': total_pages
-        }
+        'pagination': pagination
     })
 
+@api_bp.route('/teams/analyze', methods=['POST'])
+def analyze_teams_endpoint():
+    """
+    Analyze the type matchups of one or more teams.
+    
+    The body is either one team, {"pokemon": [{"id": 25, "moves": [85]}, ...]},
+    or a batch, {"teams": [{"pokemon": [...]}, ...]}.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return json_response({'error': 'Body must be a JSON object'}, 400)
+    if 'teams' in body:
+        teams = body['teams']
+    elif 'pokemon' in body:
+        teams = [body]
+    else:
+        return json_response({'error': 'Body must contain "pokemon" or "teams"'}, 400)
+    
+    if not isinstance(teams, list) or not all(isinstance(t, dict) and isinstance(t.get('pokemon'), list) for t in teams):
+        return json_response({'error': 'Each team must have a "pokemon" list'}, 400)
+    
+    max_teams = current_app.config.get('API_BATCH_MAX_TEAMS', 100)
+    if len(teams) > max_teams:
+        return json_response({'error': f'At most {max_teams} teams per request'}, 400)
+    
+    analyses = analyze_teams([team['pokemon'] for team in teams])
+    if 'teams' in body:
+        return json_response({'analyses': analyses})
+    return json_response(analyses[0])
+
 @api_bp.route('/generations/<int:gen_number>/theme')
 def get_theme(gen_number):
     theme = get_generation_theme(gen_number)
-    return jsonify(theme)
+    return json_response(theme)
+
+@api_bp.route('/cache/stats')
+def get_cache_stats():
+    """Hit/miss counters of the memoization cache."""
+    return json_response(tiered_cache.stats())
+
+@api_bp.route('/requests/stats')
+def get_request_stats():
+    """Latency, Mongo and render time histograms per endpoint."""
+    return json_response(instrumentation.stats())
 
 @api_bp.route('/docs', methods=['GET'])
 def api_docs():
@@ -1,14 +1,25 @@
 from flask import Blueprint, render_template, abort, request, redirect, url_for
-from pokedex_app.app.models.mongodb import mongo
+import copy
+from pokedex_app.app.models.snapshot import snapshot
 from pokedex_app.app.services.theme_service import get_generation_theme
 from pokedex_app.app.utils.helpers import calculate_type_effectiveness, get_pokemon_moves, get_pokemon_abilities
+from pokedex_app.app.utils.type_chart import type_chart
+from pokedex_app.app.utils.pagination import paginate
+from pokedex_app.app.utils.http_cache import conditional
+from pokedex_app.app.utils.page_cache import cached_page
 
 pokemon_bp = Blueprint('pokemon', __name__, url_prefix='/pokemon')
 
+# Page sizes of the list views
+POKEMON_PER_PAGE = 20
+ITEMS_PER_PAGE = 24
+MOVES_PER_PAGE = 30
+
 @pokemon_bp.route('/')
+@cached_page(params=('page', 'generation', 'type', 'q'), defaults={'page': '1'})
 def pokemon_list():
-    page = int(request.args.get('page', 1))
-    per_page = 20
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = POKEMON_PER_PAGE
     skip = (page - 1) * per_page
     
     # Get filters
@@ -16,34 +27,18 @@ def pokemon_list():
     type_filter = request.args.get('type')
     query = request.args.get('q', '')
     
-    # Build MongoDB query
-    mongo_query = {}
-    
-    if generation:
-        try:
-            mongo_query['generation'] = int(generation)
-        except ValueError:
-            pass
-    
-    if type_filter:
-        mongo_query['type'] = type_filter
-    
-    if query:
-        mongo_query['$or'] = [
-            {'name.english': {'$regex': query, '$options': 'i'}},
-            {'id': {'$eq': int(query)}} if query.isdigit() else {'name.english': {'$regex': query, '$options': 'i'}}
-        ]
+    try:
+        generation_number = int(generation) if generation else None
+    except ValueError:
+        generation_number = None
     
     # Get Pokémon data
-    total = mongo.get_collection('pokemon').count_documents(mongo_query)
-    pokemon_list = list(mongo.get_collection('pokemon')
-                       .find(mongo_query)
-                       .sort('id', 1)
-                       .skip(skip)
-                       .limit(per_page))
+    matches = snapshot.find_pokemon(generation=generation_number, type_name=type_filter, query=query)
+    total = len(matches)
+    pokemon_list = matches[skip:skip + per_page]
     
     # Get all types for filtering
-    types = list(mongo.get_collection('types').find({}, {'english': 1, 'color': 1}))
+    types = snapshot.types()
     
     # Calculate pagination
     total_pages = (total + per_page - 1) // per_page
@@ -58,8 +53,10 @@ def pokemon_list():
                           query=query)
 
 @pokemon_bp.route('/<int:pokedex_id>')
+@conditional
+@cached_page()
 def pokemon_detail(pokedex_id):
-    pokemon = mongo.get_collection('pokemon').find_one({'id': pokedex_id})
+    pokemon = snapshot.get_pokemon(pokedex_id)
     
     if not pokemon:
         abort(404)
@@ -67,56 +64,10 @@ def pokemon_detail(pokedex_id):
     # Get generation theme
     theme = get_generation_theme(pokemon.get('generation', 1))
     
-    # Get evolution chain
-    evolution_chain = []
-    
-    # If Pokémon has previous evolution
-    if pokemon.get('evolution') and 'prev' in pokemon['evolution']:
-        prev_id = int(pokemon['evolution']['prev'][0])
-        prev_pokemon = mongo.get_collection('pokemon').find_one({'id': prev_id})
-        if prev_pokemon:
-            evolution_chain.append({
-                'id': prev_pokemon['id'],
-                'name': prev_pokemon['name']['english'],
-                'image': {
-                    'sprite': prev_pokemon['image']['sprite'],
-                    'thumbnail': prev_pokemon['image']['thumbnail'],
-                    'hires': prev_pokemon['image']['hires']
-                },
-                'evolution_level': pokemon['evolution']['prev'][1] if len(pokemon['evolution']['prev']) > 1 else None,
-                'evolution_details': pokemon['evolution']['prev'][1] if len(pokemon['evolution']['prev']) > 1 else None
-            })
-    
-    # Add current Pokémon
-    evolution_chain.append({
-        'id': pokemon['id'],
-        'name': pokemon['name']['english'],
-        'image': {
-            'sprite': pokemon['image']['sprite'],
-            'thumbnail': pokemon['image']['thumbnail'],
-            'hires': pokemon['image']['hires']
-        },
-        'evolution_level': None,
-        'evolution_details': None
-    })
-    
-    # If Pokémon has next evolutions
-    if pokemon.get('evolution') and 'next' in pokemon['evolution']:
-        for next_evo in pokemon['evolution']['next']:
-            next_id = int(next_evo[0])
-            next_pokemon = mongo.get_collection('pokemon').find_one({'id': next_id})
-            if next_pokemon:
-                evolution_chain.append({
-                    'id': next_pokemon['id'],
-                    'name': next_pokemon['name']['english'],
-                    'image': {
-                        'sprite': next_pokemon['image']['sprite'],
-                        'thumbnail': next_pokemon['image']['thumbnail'],
-                        'hires': next_pokemon['image']['hires']
-                    },
-                    'evolution_level': next_evo[1] if len(next_evo) > 1 else None,
-                    'evolution_details': next_evo[1] if len(next_evo) > 1 else None
-                })
+    # Get evolution chain (whole family, including branches)
+    family = snapshot.get_evolution_family(pokedex_id)
+    evolution_chain = family['chain'] if family else []
+    evolution_tree = family['tree'] if family else None
     
     # Get type effectiveness
     type_effectiveness = calculate_type_effectiveness(pokemon['type'])
@@ -132,33 +83,10 @@ def pokemon_detail(pokedex_id):
     # Get abilities for this Pokémon
     abilities = get_pokemon_abilities(pokedex_id)
     
-    # Make sure we have the 'stats' field as expected in the template
-    if 'stats' not in pokemon:
-        # Try to build from 'base' if available
-        base = pokemon.get('base', {})
-        pokemon['stats'] = {
-            'hp': base.get('HP', 0),
-            'attack': base.get('Attack', 0),
-            'defense': base.get('Defense', 0),
-            'special_attack': base.get('Sp. Attack', 0),
-            'special_defense': base.get('Sp. Defense', 0),
-            'speed': base.get('Speed', 0),
-        }
-    # If stats exist but use uppercase keys, normalize them
-    elif 'HP' in pokemon['stats']:
-        s = pokemon['stats']
-        pokemon['stats'] = {
-            'hp': s.get('HP', 0),
-            'attack': s.get('Attack', 0),
-            'defense': s.get('Defense', 0),
-            'special_attack': s.get('Sp. Attack', 0),
-            'special_defense': s.get('Sp. Defense', 0),
-            'speed': s.get('Speed', 0),
-        }
-    
     return render_template('pokemon/detail.html',
                           pokemon=pokemon,
                           evolution_chain=evolution_chain,
+                          evolution_tree=evolution_tree,
                           type_effectiveness=type_effectiveness,
                           moves=moves,
                           abilities=abilities,
@@ -175,17 +103,17 @@ def compare():
         pokemon1_id = int(pokemon_ids[0])
         pokemon2_id = int(pokemon_ids[1])
         
-        pokemon1 = mongo.get_collection('pokemon').find_one({'id': pokemon1_id})
-        pokemon2 = mongo.get_collection('pokemon').find_one({'id': pokemon2_id})
+        pokemon1 = snapshot.get_pokemon(pokemon1_id)
+        pokemon2 = snapshot.get_pokemon(pokemon2_id)
         
         if pokemon1 and pokemon2:
-            # Add type effectiveness for both Pokemon
-            pokemon1['type_effectiveness'] = calculate_type_effectiveness(pokemon1['types'])
-            pokemon2['type_effectiveness'] = calculate_type_effectiveness(pokemon2['types'])
+            # Snapshot records are shared, work on copies
+            pokemon1 = copy.deepcopy(pokemon1)
+            pokemon2 = copy.deepcopy(pokemon2)
             
-            # Calculate stats total for both
-            pokemon1['stats']['total'] = sum(stat for stat in pokemon1['stats'].values() if isinstance(stat, int))
-            pokemon2['stats']['total'] = sum(stat for stat in pokemon2['stats'].values() if isinstance(stat, int))
+            # Add type effectiveness for both Pokemon in one lookup
+            pokemon1['type_effectiveness'], pokemon2['type_effectiveness'] = type_chart.batch_effectiveness(
+                [pokemon1.get('type', []), pokemon2.get('type', [])])
             
             return render_template('pokemon/compare.html', 
                 pokemon1=pokemon1, 
@@ -197,50 +125,40 @@ def compare():
     return render_template('pokemon/compare.html', pokemon1=None, pokemon2=None)
 
 @pokemon_bp.route('/items')
+@cached_page(params=('page', 'after', 'category', 'q'), defaults={'page': '1'})
 def items_list():
-    page = int(request.args.get('page', 1))
-    per_page = 24
-    skip = (page - 1) * per_page
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = ITEMS_PER_PAGE
+    after = request.args.get('after')
     
     # Get filters
     category = request.args.get('category')
     query = request.args.get('q', '')
     
-    # Build MongoDB query
-    mongo_query = {}
-    
-    if category:
-        mongo_query['category'] = category
-    
-    if query:
-        mongo_query['name'] = {'$regex': query, '$options': 'i'}
-    
-    # Get items data
-    total = mongo.get_collection('items').count_documents(mongo_query)
-    items_list = list(mongo.get_collection('items')
-                    .find(mongo_query)
-                    .sort('id', 1)
-                    .skip(skip)
-                    .limit(per_page))
+    # Get items data, by cursor when 'after' is given (infinite scroll)
+    matches = snapshot.find_items(category=category, query=query)
+    try:
+        items_list, pagination = paginate(matches, per_page, page=page, after=after)
+    except ValueError:
+        abort(400)
     
     # Get item categories for filtering
-    categories = mongo.get_collection('items').distinct('category')
-    
-    # Calculate pagination
-    total_pages = (total + per_page - 1) // per_page
+    categories = snapshot.item_categories()
     
     return render_template('pokemon/items.html',
                           items_list=items_list,
                           categories=categories,
-                          current_page=page,
-                          total_pages=total_pages,
+                          current_page=pagination['page'],
+                          total_pages=pagination['total_pages'],
+                          next_cursor=pagination['next_cursor'],
                           category=category,
                           query=query)
 
 @pokemon_bp.route('/moves')
+@cached_page(params=('page', 'type', 'category', 'q'), defaults={'page': '1'})
 def moves_list():
-    page = int(request.args.get('page', 1))
-    per_page = 30
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = MOVES_PER_PAGE
     skip = (page - 1) * per_page
     
     # Get filters
@@ -248,55 +166,28 @@ def moves_list():
     category = request.args.get('category')
     query = request.args.get('q', '')
     
-    # Build MongoDB query
-    mongo_query = {}
-    
-    if move_type:
-        mongo_query['type'] = move_type
-        
-    # For now, we can't filter by category as it's in Japanese
-    # when we have proper mapping we can uncomment this
-    # if category:
-    #    mongo_query['category'] = category
-    
-    if query:
-        mongo_query['ename'] = {'$regex': query, '$options': 'i'}
-    
     # Get moves data
-    total = mongo.get_collection('moves').count_documents(mongo_query)
-    moves_data = list(mongo.get_collection('moves')
-                    .find(mongo_query)
-                    .sort('id', 1)
-                    .skip(skip)
-                    .limit(per_page))
-    
-    # Map category names to English
-    category_map = {
-        "物理": "physical",
-        "特殊": "special", 
-        "变化": "status"
-    }
+    matches = snapshot.find_moves(type_name=move_type, query=query, category=category or None)
+    total = len(matches)
+    moves_data = matches[skip:skip + per_page]
     
     # Transform moves data to match template expectations
     moves_list = []
     for move in moves_data:
-        # Map the Japanese category to English or use "status" as default
-        eng_category = category_map.get(move.get('category', ''), 'status')
-        
         # Create properly structured move data
         formatted_move = {
             'name': move.get('ename', 'Unknown'),
             'type': move.get('type', 'Normal'),
-            'category': eng_category,
-            'power': move.get('power', 0),
-            'accuracy': move.get('accuracy', 0),
+            'category': move['category'],
+            'power': move['power'] or 0,
+            'accuracy': move['accuracy'] or 0,
             'pp': move.get('pp', 0),
             'effect': move.get('effect', 'No effect information available.')
         }
         moves_list.append(formatted_move)
     
     # Get all types for filtering
-    types = list(mongo.get_collection('types').find({}, {'english': 1, 'color': 1}))
+    types = snapshot.types()
     
     # Get categories
     categories = ['physical', 'special', 'status']
@@ -317,6 +208,6 @@ def moves_list():
 @pokemon_bp.route('/team-builder')
 def team_builder():
     # Get all types for type coverage analysis
-    types = list(mongo.get_collection('types').find({}, {'name': 1, 'color': 1, 'weaknesses': 1, 'strengths': 1}))
+    types = snapshot.types()
     
     return render_template('pokemon/team_builder.html', types=types) 
\ No newline at end of file
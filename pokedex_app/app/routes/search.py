@@ -1,6 +1,5 @@
 from flask import Blueprint, request, jsonify
-from pokedex_app.app.models.mongodb import mongo
-from pokedex_app.app.utils.helpers import search_pokemon
+from pokedex_app.app.utils.helpers import search_pokemon, fuzzy_search
 
 search_bp = Blueprint('search', __name__, url_prefix='/search')
 
@@ -8,11 +7,15 @@ search_bp = Blueprint('search', __name__, url_prefix='/search')
 def search():
     query = request.args.get('q', '')
     limit = int(request.args.get('limit', 10))
+    fuzzy = request.args.get('fuzzy') == '1'
     
     if not query or len(query) < 2:
         return jsonify([])
     
-    # Get search results
-    results = search_pokemon(query, limit)
+    # Get search results, tolerating typos in fuzzy mode
+    if fuzzy:
+        results = fuzzy_search(query, limit)
+    else:
+        results = search_pokemon(query, limit)
     
     return jsonify(results) 
\ No newline at end of file
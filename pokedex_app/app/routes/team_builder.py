@@ -1,22 +1,88 @@
-from flask import Blueprint, render_template, request, jsonify, session
-from pokedex_app.app.models.mongodb import mongo
-from pokedex_app.app.services.pokemon_service import get_pokemon_by_id
-from bson.objectid import ObjectId
+import uuid
+from flask import Blueprint, render_template, request, jsonify, session, current_app
+from pokedex_app.app.models.snapshot import snapshot
+from pokedex_app.app.models.team_store import team_store
+from pokedex_app.app.utils.team_analysis import analyze_team as analyze_team_members
+from pokedex_app.app.utils.projection import parse_fields, project
 
 # Create a Blueprint for team builder routes
 team_builder_bp = Blueprint('team_builder', __name__, url_prefix='/team-builder')
 
+# Fields of each member's Pokémon included in responses
+MEMBER_FIELDS = parse_fields('summary')
+
+# Fields of each Pokémon offered by the selector
+SELECTOR_FIELDS = parse_fields('id,name,type,image.sprite')
+
+def move_refs(moves):
+    """Reduce move dicts to their IDs."""
+    return [move['id'] if isinstance(move, dict) and 'id' in move else move for move in moves or []]
+
+def compact_member(member, position):
+    """
+    Return the reference stored in the session for a team member.
+    
+    Older sessions and saved teams embed the whole Pokémon document under
+    'pokemon'; only its ID is kept.
+    """
+    pokemon_id = member.get('id')
+    if pokemon_id is None and isinstance(member.get('pokemon'), dict):
+        pokemon_id = member['pokemon'].get('id')
+    return {
+        'id': pokemon_id,
+        'moves': move_refs(member.get('moves')),
+        'ability': member.get('ability'),
+        'item': member.get('item'),
+        'position': position
+    }
+
+def compact_team(team):
+    """Return a team holding only member references."""
+    return {
+        'name': team.get('name', 'My Team'),
+        'pokemon': [compact_member(member, i) for i, member in enumerate(team.get('pokemon', []))]
+    }
+
+def get_session_team():
+    """Get the team from the session, converting legacy embedded members."""
+    team = session.get('team')
+    if team is None:
+        return {'pokemon': [], 'name': 'My Team'}
+    if any('pokemon' in member for member in team.get('pokemon', [])):
+        team = compact_team(team)
+        session['team'] = team
+    return team
+
+def get_owner():
+    """Return the ID that owns the current visitor's saved teams."""
+    # There are no user accounts, so each session gets an anonymous owner ID
+    if 'owner' not in session:
+        session['owner'] = uuid.uuid4().hex
+    return session['owner']
+
+def summarize_pokemon(pokemon_id):
+    """Return the ID, name and sprite of a Pokémon for list views."""
+    pokemon = snapshot.get_pokemon(pokemon_id)
+    if not pokemon:
+        return {'id': pokemon_id, 'name': None, 'sprite': None}
+    return {'id': pokemon_id, 'name': pokemon['name']['english'], 'sprite': pokemon['image']['sprite']}
+
+def hydrate_team(team):
+    """Return a copy of a team with each member's Pokémon filled in from the snapshot."""
+    members = []
+    for member in team['pokemon']:
+        pokemon = snapshot.get_pokemon(member['id'])
+        members.append(dict(member, pokemon=project(pokemon, MEMBER_FIELDS) if pokemon else None))
+    return dict(team, pokemon=members)
+
 @team_builder_bp.route('/', methods=['GET'])
 def team_builder():
     """Render the team builder page."""
     # Get team from session if it exists, otherwise create empty team
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
+    team = hydrate_team(get_session_team())
     
-    # Get all Pokemon for the selector
-    pokemon_collection = mongo.get_collection('pokemon')
-    all_pokemon = list(pokemon_collection.find({}, 
-                                             {'id': 1, 'name': 1, 'type': 1, 'image.sprite': 1})
-                      .sort('id', 1))
+    # Get all Pokemon for the selector, with only the fields it shows
+    all_pokemon = [project(pokemon, SELECTOR_FIELDS) for pokemon in snapshot.all_pokemon()]
     
     return render_template('team_builder/index.html', team=team, all_pokemon=all_pokemon)
 
@@ -27,20 +93,19 @@ def add_pokemon():
     pokemon_id = int(data.get('pokemon_id'))
     
     # Get the team from session or create a new one
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
+    team = get_session_team()
     
     # Check if team is already full (6 Pokemon)
     if len(team['pokemon']) >= 6:
         return jsonify({'success': False, 'message': 'Team is already full (max 6 Pokemon)'}), 400
     
-    # Get Pokemon data
-    pokemon = get_pokemon_by_id(pokemon_id)
-    if not pokemon:
+    # Check the Pokemon exists
+    if not snapshot.get_pokemon(pokemon_id):
         return jsonify({'success': False, 'message': 'Pokemon not found'}), 404
     
-    # Add Pokemon to team
+    # Add a reference to the Pokemon to the team
     team_member = {
-        'pokemon': pokemon,
+        'id': pokemon_id,
         'moves': [],
         'ability': None,
         'item': None,
@@ -50,12 +115,12 @@ def add_pokemon():
     team['pokemon'].append(team_member)
     session['team'] = team
     
-    return jsonify({'success': True, 'team': team})
+    return jsonify({'success': True, 'team': hydrate_team(team)})
 
 @team_builder_bp.route('/remove/<int:position>', methods=['DELETE'])
 def remove_pokemon(position):
     """Remove a Pokemon from the team."""
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
+    team = get_session_team()
     
     if 0 <= position < len(team['pokemon']):
         # Remove Pokemon at the specified position
@@ -66,7 +131,7 @@ def remove_pokemon(position):
             member['position'] = i
         
         session['team'] = team
-        return jsonify({'success': True, 'team': team})
+        return jsonify({'success': True, 'team': hydrate_team(team)})
     
     return jsonify({'success': False, 'message': 'Invalid position'}), 400
 
@@ -81,19 +146,19 @@ def clear_team():
 def update_team_member(position):
     """Update a team member's moves, ability or item."""
     data = request.json
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
+    team = get_session_team()
     
     if 0 <= position < len(team['pokemon']):
         # Update the specified fields
         if 'moves' in data:
-            team['pokemon'][position]['moves'] = data['moves']
+            team['pokemon'][position]['moves'] = move_refs(data['moves'])
         if 'ability' in data:
             team['pokemon'][position]['ability'] = data['ability']
         if 'item' in data:
             team['pokemon'][position]['item'] = data['item']
         
         session['team'] = team
-        return jsonify({'success': True, 'team': team})
+        return jsonify({'success': True, 'team': hydrate_team(team)})
     
     return jsonify({'success': False, 'message': 'Invalid position'}), 400
 
@@ -101,117 +166,121 @@ def update_team_member(position):
 def rename_team():
     """Rename the team."""
     data = request.json
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
+    team = get_session_team()
     
     team['name'] = data.get('name', 'My Team')
     session['team'] = team
     
-    return jsonify({'success': True, 'team': team})
+    return jsonify({'success': True, 'team': hydrate_team(team)})
 
 @team_builder_bp.route('/analyze', methods=['GET'])
 def analyze_team():
     """Analyze the current team's strengths and weaknesses."""
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
-    
-    # Initialize type effectiveness counter
-    type_effectiveness = {
-        'weaknesses': {},
-        'resistances': {},
-        'immunities': {}
-    }
+    team = get_session_team()
     
-    # Get all type data
-    types_collection = mongo.get_collection('types')
-    types = {t['name']: t for t in types_collection.find()}
-    
-    # Analyze each Pokemon in the team
-    for member in team['pokemon']:
-        pokemon = member['pokemon']
-        pokemon_types = pokemon['type']
-        
-        # Process each Pokemon's type effectiveness
-        for attack_type, type_data in types.items():
-            # Skip if this is one of the Pokemon's types
-            damage_factor = 1.0
-            
-            # Calculate damage factor based on Pokemon's types
-            for poke_type in pokemon_types:
-                if attack_type in types[poke_type]['immunes']:
-                    damage_factor = 0
-                    break
-                elif attack_type in types[poke_type]['weaknesses']:
-                    damage_factor *= 2
-                elif attack_type in types[poke_type]['resistances']:
-                    damage_factor *= 0.5
-            
-            # Register the effectiveness
-            if damage_factor > 1:
-                type_effectiveness['weaknesses'][attack_type] = type_effectiveness['weaknesses'].get(attack_type, 0) + 1
-            elif damage_factor < 1 and damage_factor > 0:
-                type_effectiveness['resistances'][attack_type] = type_effectiveness['resistances'].get(attack_type, 0) + 1
-            elif damage_factor == 0:
-                type_effectiveness['immunities'][attack_type] = type_effectiveness['immunities'].get(attack_type, 0) + 1
-    
-    # Sort effectiveness by count
-    for category in type_effectiveness:
-        type_effectiveness[category] = dict(sorted(
-            type_effectiveness[category].items(),
-            key=lambda item: item[1],
-            reverse=True
-        ))
+    analysis = analyze_team_members(team['pokemon'])
     
     return jsonify({
         'success': True, 
-        'analysis': type_effectiveness, 
-        'team': team
+        'analysis': analysis, 
+        'team': hydrate_team(team)
     })
 
 @team_builder_bp.route('/save', methods=['POST'])
 def save_team():
-    """Save team to database for the user."""
-    # In a real app, you'd associate this with a user
-    # For this demo, we'll just save it to the database
-    team = session.get('team', {'pokemon': [], 'name': 'My Team'})
+    """Save the session team for the current visitor."""
+    team = get_session_team()
     
     if not team['pokemon']:
         return jsonify({'success': False, 'message': 'Cannot save empty team'}), 400
     
     # Save to database
-    teams_collection = mongo.get_collection('teams')
-    result = teams_collection.insert_one(team)
+    team_id = team_store.save(get_owner(), team)
     
     return jsonify({
         'success': True, 
         'message': 'Team saved successfully',
-        'team_id': str(result.inserted_id)
+        'team_id': team_id
     })
 
+@team_builder_bp.route('/save/bulk', methods=['POST'])
+def save_teams():
+    """Save several teams, given as {"teams": [{"name": ..., "pokemon": [...]}]}."""
+    data = request.get_json(silent=True) or {}
+    teams = data.get('teams')
+    
+    if not isinstance(teams, list) or not teams:
+        return jsonify({'success': False, 'message': 'No teams given'}), 400
+    if len(teams) > current_app.config.get('API_BATCH_MAX_TEAMS', 100):
+        return jsonify({'success': False, 'message': 'Too many teams'}), 400
+    if not all(isinstance(team, dict) and isinstance(team.get('pokemon'), list) for team in teams):
+        return jsonify({'success': False, 'message': 'Each team must have a "pokemon" list'}), 400
+    
+    compact = [compact_team(team) for team in teams]
+    if any(not team['pokemon'] or len(team['pokemon']) > 6 for team in compact):
+        return jsonify({'success': False, 'message': 'Teams must have 1 to 6 Pokemon'}), 400
+    
+    team_ids = team_store.save_many(get_owner(), compact)
+    
+    return jsonify({'success': True, 'team_ids': team_ids})
+
 @team_builder_bp.route('/list', methods=['GET'])
 def list_teams():
-    """List all saved teams."""
-    teams_collection = mongo.get_collection('teams')
-    teams = list(teams_collection.find())
+    """List the current visitor's saved teams, newest first, one page at a time."""
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    after = request.args.get('after')
+    
+    try:
+        teams, next_cursor = team_store.list_summaries(get_owner(), limit, after)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
     
-    # Convert ObjectId to string
+    summaries = []
     for team in teams:
-        team['_id'] = str(team['_id'])
+        summaries.append({
+            '_id': str(team['_id']),
+            'name': team.get('name', 'My Team'),
+            'size': team.get('size', 0),
+            'created_at': team.get('created_at'),
+            'pokemon': [summarize_pokemon(pokemon_id) for pokemon_id in team.get('pokemon_ids', [])]
+        })
     
-    return jsonify({'success': True, 'teams': teams})
+    return jsonify({
+        'success': True,
+        'teams': summaries,
+        'pagination': {'per_page': limit, 'next_cursor': next_cursor}
+    })
 
 @team_builder_bp.route('/load/<team_id>', methods=['GET'])
 def load_team(team_id):
     """Load a team from the database."""
-    teams_collection = mongo.get_collection('teams')
+    team = team_store.load(team_id)
+    if not team:
+        return jsonify({'success': False, 'message': 'Team not found'}), 404
     
-    try:
-        team = teams_collection.find_one({'_id': ObjectId(team_id)})
-        if team:
-            # Remove the ObjectId
-            team['_id'] = str(team['_id'])
-            # Save to session
-            session['team'] = team
-            return jsonify({'success': True, 'team': team})
-        else:
-            return jsonify({'success': False, 'message': 'Team not found'}), 404
-    except Exception as e:
-        return jsonify({'success': False, 'message': str(e)}), 400 
\ No newline at end of file
+    # Keep only member references in the session
+    session['team'] = compact_team(team)
+    team = hydrate_team(session['team'])
+    team['_id'] = team_id
+    return jsonify({'success': True, 'team': team})
+
+@team_builder_bp.route('/load/bulk', methods=['POST'])
+def load_teams():
+    """Load several saved teams, given as {"ids": [...]}, without touching the session."""
+    data = request.get_json(silent=True) or {}
+    team_ids = data.get('ids')
+    
+    if not isinstance(team_ids, list) or not team_ids:
+        return jsonify({'success': False, 'message': 'No ids given'}), 400
+    if len(team_ids) > current_app.config.get('API_BATCH_MAX_TEAMS', 100):
+        return jsonify({'success': False, 'message': 'Too many ids'}), 400
+    
+    teams, missing = team_store.load_many(team_ids)
+    
+    loaded = []
+    for team in teams:
+        hydrated = hydrate_team(compact_team(team))
+        hydrated['_id'] = str(team['_id'])
+        loaded.append(hydrated)
+    
+    return jsonify({'success': True, 'teams': loaded, 'missing': missing})
@@ -0,0 +1,81 @@
+from flask import url_for
+
+from pokedex_app.app.models.snapshot import snapshot
+from pokedex_app.app.routes import api
+from pokedex_app.app.routes.pokemon import POKEMON_PER_PAGE, ITEMS_PER_PAGE, MOVES_PER_PAGE
+
+# Move categories offered by the moves view's filter
+MOVE_CATEGORIES = ('physical', 'special', 'status')
+
+
+def _page_count(total, per_page):
+    return max(1, (total + per_page - 1) // per_page)
+
+
+def _list_urls(endpoint, total, per_page, **filters):
+    """Return (endpoint, url) for every page of a list view with the given filters."""
+    filters = {name: value for name, value in filters.items() if value is not None}
+    return [
+        (endpoint, url_for(endpoint, page=page, **filters))
+        for page in range(1, _page_count(total, per_page) + 1)
+    ]
+
+
+def site_urls(filters=False):
+    """
+    List the URLs of every page and API document that only depends on the dataset.
+
+    Must be called within a request context (e.g. app.test_request_context())
+    so URLs can be built.
+
+    Args:
+        filters (bool): Also list every page of every filter combination of
+            the list views (generation and type for Pokémon, type and
+            category for moves, category for items). Free-text searches
+            are never listed.
+
+    Returns:
+        list: (endpoint, url) tuples
+    """
+    urls = [('main.index', url_for('main.index'))]
+
+    # List views, every page without filters
+    urls += _list_urls('pokemon.pokemon_list', len(snapshot.all_pokemon()), POKEMON_PER_PAGE)
+    urls += _list_urls('pokemon.moves_list', len(snapshot.find_moves()), MOVES_PER_PAGE)
+    urls += _list_urls('pokemon.items_list', len(snapshot.find_items()), ITEMS_PER_PAGE)
+
+    if filters:
+        generations = sorted({pokemon.get('generation') for pokemon in snapshot.all_pokemon()} - {None})
+        type_names = [type_data['english'] for type_data in snapshot.types()]
+
+        for generation in [None] + generations:
+            for type_name in [None] + type_names:
+                if generation is None and type_name is None:
+                    continue
+                total = len(snapshot.find_pokemon(generation=generation, type_name=type_name))
+                urls += _list_urls('pokemon.pokemon_list', total, POKEMON_PER_PAGE,
+                                   generation=generation, type=type_name)
+
+        for type_name in [None] + type_names:
+            for category in (None,) + MOVE_CATEGORIES:
+                if type_name is None and category is None:
+                    continue
+                total = len(snapshot.find_moves(type_name=type_name, category=category))
+                urls += _list_urls('pokemon.moves_list', total, MOVES_PER_PAGE,
+                                   type=type_name, category=category)
+
+        for category in snapshot.item_categories():
+            total = len(snapshot.find_items(category=category))
+            urls += _list_urls('pokemon.items_list', total, ITEMS_PER_PAGE, category=category)
+
+    # API lists, every page at the default page size without filters
+    urls += _list_urls('api.get_pokemon_list', len(snapshot.all_pokemon()), api.POKEMON_PER_PAGE)
+    urls += _list_urls('api.get_moves', len(snapshot.find_moves()), api.MOVES_PER_PAGE)
+
+    # Detail pages and API documents
+    for pokemon in snapshot.all_pokemon():
+        urls.append(('pokemon.pokemon_detail', url_for('pokemon.pokemon_detail', pokedex_id=pokemon['id'])))
+        urls.append(('api.get_pokemon', url_for('api.get_pokemon', pokemon_id=pokemon['id'])))
+    urls.append(('api.get_types', url_for('api.get_types')))
+
+    return urls
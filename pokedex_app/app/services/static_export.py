@@ -0,0 +1,309 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from pokedex_app.app.models.snapshot import get_dataset_meta, snapshot
+from pokedex_app.app.services.sitemap import site_urls
+
+# brotli is optional; without it only .gz files are written
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# File in the export directory recording what each page was rendered from
+MANIFEST_NAME = '.export-manifest.json'
+
+# Directory in the export directory pages are rendered into, and moved out
+# of once the whole export is known to come from one dataset version
+STAGING_NAME = '.export-staging'
+
+# Exported files are compressed once, so use the strongest settings
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# URLs rendered per task sent to a worker process
+CHUNK_SIZE = 50
+
+# App used by each worker process and the dataset version it must serve,
+# see _init_worker
+_worker_app = None
+_worker_version = None
+
+
+class DatasetChangedError(RuntimeError):
+    """Raised when the dataset is re-imported while pages are being exported."""
+
+
+def export_filename(url, mimetype):
+    """
+    Return the path, relative to the export directory, a URL is written to.
+
+    /pokemon/25 becomes pokemon/25.html, /pokemon/ becomes
+    pokemon/index.html and /api/types becomes api/types.json. Query
+    parameters are appended in sorted order after an '@', e.g.
+    pokemon/index@page=2&type=Fire.html.
+    """
+    parts = urlsplit(url)
+    path = parts.path.lstrip('/')
+    if not path or path.endswith('/'):
+        path += 'index'
+    if parts.query:
+        path += '@' + urlencode(sorted(parse_qsl(parts.query)))
+    extension = '.json' if mimetype == 'application/json' else '.html'
+    return path + extension
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class SourceDigests:
+    """
+    Digests of the records each exported page is rendered from.
+
+    A page is re-exported when its digest changes: detail pages depend on
+    their Pokémon's evolution family, the types and the moves (learnsets
+    are built from them), list pages on the collection they list, and
+    every page on the templates.
+    """
+
+    def __init__(self, template_folder):
+        data = snapshot.data
+        self.pokemon = {pokemon['id']: _digest(pokemon) for pokemon in data.pokemon}
+        self.collections = {
+            'pokemon': _digest(sorted(self.pokemon.items())),
+            'moves': _digest(data.moves),
+            'items': _digest(data.items),
+            'types': _digest(data.types)
+        }
+        self.templates = self._templates_digest(template_folder)
+
+    @staticmethod
+    def _templates_digest(template_folder):
+        digest = hashlib.sha1()
+        for root, dirs, files in sorted(os.walk(template_folder)):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, template_folder).encode('utf-8'))
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    def page(self, endpoint, view_args):
+        """Return the digest of everything a page is rendered from."""
+        collections = self.collections
+        if endpoint == 'pokemon.pokemon_detail':
+            pokemon_id = view_args['pokedex_id']
+            family = snapshot.get_evolution_family(pokemon_id)
+            members = family['members'] if family else [pokemon_id]
+            sources = [self.pokemon.get(member) for member in members]
+            sources += [collections['types'], collections['moves']]
+        elif endpoint == 'api.get_pokemon':
+            sources = [self.pokemon.get(view_args['pokemon_id']), collections['types']]
+        elif endpoint == 'pokemon.moves_list':
+            sources = [collections['moves'], collections['types']]
+        elif endpoint == 'api.get_moves':
+            sources = [collections['moves']]
+        elif endpoint == 'pokemon.items_list':
+            sources = [collections['items']]
+        elif endpoint == 'api.get_types':
+            sources = [collections['types']]
+        else:
+            # The home page and the Pokémon lists, HTML and API
+            sources = [collections['pokemon'], collections['types']]
+        return _digest([self.templates, endpoint, sources])
+
+
+def _write(path, data):
+    """Write a file atomically, so a web server never serves a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _export_urls(app, urls, output_dir):
+    """
+    Render URLs with the app's test client and write them with compressed siblings.
+
+    Returns:
+        list: (url, written file names or None, status, bytes written)
+    """
+    client = app.test_client()
+    results = []
+    for url in urls:
+        try:
+            response = client.get(url)
+        except Exception:
+            # Propagated in debug mode; count it like the 500 it would be
+            results.append((url, None, 500, 0))
+            continue
+        if response.status_code != 200:
+            results.append((url, None, response.status_code, 0))
+            continue
+
+        body = response.get_data()
+        filename = export_filename(url, response.mimetype)
+        path = os.path.join(output_dir, filename)
+        files = [filename, filename + '.gz']
+        _write(path, body)
+        compressed = gzip.compress(body, GZIP_LEVEL, mtime=0)
+        _write(path + '.gz', compressed)
+        size = len(body) + len(compressed)
+        if brotli is not None:
+            compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+            _write(path + '.br', compressed)
+            files.append(filename + '.br')
+            size += len(compressed)
+        results.append((url, files, 200, size))
+    return results
+
+
+def _check_dataset_version(expected):
+    # The database is the source of truth; the snapshot is checked too, as
+    # it may have been reloaded (or, in a worker, loaded) from another version
+    for version in (get_dataset_meta()['version'], snapshot.version):
+        if version != expected:
+            raise DatasetChangedError(
+                f"Dataset version changed from {expected} to {version} during the export; "
+                "run it again once the import has finished")
+
+
+def _init_worker(config, dataset_version):
+    global _worker_app, _worker_version
+    from pokedex_app.app import create_app
+    # create_app() reads the uppercase attributes of a config object
+    _worker_app = create_app(SimpleNamespace(**config))
+    _worker_version = dataset_version
+
+
+def _export_chunk(urls, output_dir):
+    # Checked before and after, so a chunk is never written from another
+    # dataset version than the digests were computed from
+    _check_dataset_version(_worker_version)
+    results = _export_urls(_worker_app, urls, output_dir)
+    _check_dataset_version(_worker_version)
+    return results
+
+
+def _load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('pages', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def export_site(app, output_dir, processes=1, full=False):
+    """
+    Render every dataset page and API document to static files.
+
+    Pages are written as .html/.json files with .gz (and, if brotli is
+    installed, .br) siblings, laid out by export_filename(). A manifest
+    records the source digest of each page, so later exports only render
+    pages whose records or templates changed, and delete the files of
+    pages that no longer exist. Pages are rendered into a staging directory
+    and only moved into place once the dataset is known not to have changed,
+    so the export never mixes pages of two dataset versions.
+
+    Args:
+        app (Flask): Application created by create_app()
+        output_dir (str): Export directory
+        processes (int): Worker processes; each creates its own app with
+            app's config. 1 renders in this process with app.
+        full (bool): Re-export every page, ignoring the manifest
+
+    Returns:
+        dict: {pages, rendered, unchanged, deleted, errors, bytes, seconds}
+
+    Raises:
+        DatasetChangedError: If the dataset version changed during the
+            export; the export directory is left as it was
+    """
+    started = time.perf_counter()
+    output_dir = os.path.abspath(output_dir)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    staging_dir = os.path.join(output_dir, STAGING_NAME)
+    previous = {} if full else _load_manifest(manifest_path)
+
+    with app.test_request_context():
+        # Export what is in the database now, not what the snapshot last saw
+        dataset_version = snapshot.reload().version
+        digests = SourceDigests(os.path.join(app.root_path, app.template_folder))
+        adapter = app.url_map.bind('localhost')
+        pages = {}
+        for endpoint, url in site_urls(filters=True):
+            view_args = adapter.match(urlsplit(url).path)[1]
+            pages[url] = digests.page(endpoint, view_args)
+
+    # Keep pages whose sources are unchanged and whose files are still there
+    manifest = {}
+    pending = []
+    for url, digest in pages.items():
+        entry = previous.get(url)
+        if (entry and entry['digest'] == digest
+                and all(os.path.exists(os.path.join(output_dir, name)) for name in entry['files'])):
+            manifest[url] = entry
+        else:
+            pending.append(url)
+
+    # Left over by an export that was interrupted
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    try:
+        if processes > 1 and pending:
+            chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(dict(app.config), dataset_version)) as pool:
+                results = [result for chunk in pool.map(_export_chunk, chunks, [staging_dir] * len(chunks))
+                           for result in chunk]
+        else:
+            results = _export_urls(app, pending, staging_dir)
+        _check_dataset_version(dataset_version)
+
+        errors = []
+        written = 0
+        for url, files, status, size in results:
+            if files is None:
+                errors.append((url, status))
+                continue
+            for name in files:
+                path = os.path.join(output_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(os.path.join(staging_dir, name), path)
+            manifest[url] = {'digest': pages[url], 'files': files}
+            written += size
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # Remove the files of pages that are no longer part of the site
+    deleted = 0
+    for url, entry in previous.items():
+        if url not in pages:
+            for name in entry['files']:
+                try:
+                    os.remove(os.path.join(output_dir, name))
+                except FileNotFoundError:
+                    pass
+            deleted += 1
+
+    _write(manifest_path, json.dumps({'dataset_version': dataset_version, 'pages': manifest},
+                                     sort_keys=True).encode('utf-8'))
+
+    return {
+        'pages': len(pages),
+        'rendered': len(results) - len(errors),
+        'unchanged': len(pages) - len(pending),
+        'deleted': deleted,
+        'errors': errors,
+        'bytes': written,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
@@ -0,0 +1,101 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pokedex_app.app.services.sitemap import site_urls
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def cached_urls(app, urls):
+    """Keep the (endpoint, url) entries whose view caches its rendered page."""
+    return [
+        (endpoint, url) for endpoint, url in urls
+        if getattr(app.view_functions.get(endpoint), 'page_cached', False)
+    ]
+
+
+def warm_up(app, workers=8, urls=None):
+    """
+    Request every cached page once so the page and fragment caches are filled.
+
+    Only views wrapped in cached_page() are requested; the API documents
+    are built from the snapshot on every request and have nothing to warm.
+    Requests go through the app's test client from a pool of threads, which
+    share the app's in-process caches. When the L2 cache is shared (Redis),
+    running this from a separate process warms every app server.
+
+    Args:
+        app (Flask): Application created by create_app()
+        workers (int): Number of concurrent requests
+        urls (list): (endpoint, url) tuples, every cached site URL by default
+
+    Returns:
+        dict: {requests, errors, seconds, requests_per_second,
+               endpoints: {endpoint: {count, mean_ms, p95_ms, max_ms}}}
+    """
+    if urls is None:
+        with app.test_request_context():
+            urls = cached_urls(app, site_urls())
+
+    local = threading.local()
+
+    def fetch(entry):
+        endpoint, url = entry
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        try:
+            status = client.get(url).status_code
+        except Exception:
+            # Propagated in debug mode; count it like the 500 it would be
+            status = 500
+        return endpoint, url, status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+
+    timings = {}
+    errors = []
+    for endpoint, url, status, seconds in results:
+        timings.setdefault(endpoint, []).append(seconds * 1000)
+        if status >= 400:
+            errors.append((url, status))
+
+    endpoints = {}
+    for endpoint, values in timings.items():
+        values.sort()
+        endpoints[endpoint] = {
+            'count': len(values),
+            'mean_ms': round(sum(values) / len(values), 2),
+            'p95_ms': round(_percentile(values, 0.95), 2),
+            'max_ms': round(values[-1], 2)
+        }
+
+    return {
+        'requests': len(results),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(results) / elapsed, 1) if elapsed else 0.0,
+        'endpoints': endpoints
+    }
+
+
+def format_report(report):
+    """Format a warm_up() report as lines of text."""
+    lines = [
+        f"{report['requests']} requests in {report['seconds']}s "
+        f"({report['requests_per_second']} req/s), {len(report['errors'])} errors"
+    ]
+    for endpoint, timing in sorted(report['endpoints'].items()):
+        lines.append(f"  {endpoint:<28} {timing['count']:>5}  mean {timing['mean_ms']:>8.2f} ms  "
+                     f"p95 {timing['p95_ms']:>8.2f} ms  max {timing['max_ms']:>8.2f} ms")
+    for url, status in report['errors'][:20]:
+        lines.append(f"  {status} {url}")
+    return lines
@@ -0,0 +1,251 @@
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from pokedex_app.app.models.snapshot import snapshot
+from pokedex_app.app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe, size-bounded in-process cache with per-entry expiry."""
+
+    def __init__(self, max_items=2048):
+        self.max_items = max_items
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredCache:
+    """
+    Two-level memoization cache.
+
+    L1 is an in-process LRU, L2 is the backend configured for Flask-Caching
+    (SimpleCache in development, Redis in production). Keys embed the
+    dataset version, so a new import invalidates every entry; L1 is also
+    cleared as soon as a new version is seen. They also embed
+    HTTP_CACHE_SALT, so servers running different code never share cached
+    pages or fragments in L2.
+
+    get_or_set() and memoize() compute a missing value once per process:
+    concurrent callers asking for the same cold key wait for the first one
+    instead of all computing it.
+    """
+
+    def __init__(self, app=None, backend=None):
+        self.l1 = LRUCache()
+        self.l2 = None
+        self.default_timeout = 300
+        self._version = None
+        self.salt = ''
+        self._stats_lock = threading.Lock()
+        self._stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0}
+        # Key -> [lock, number of threads using it], for single-flight computes
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, backend)
+
+    def init_app(self, app, backend=None):
+        """
+        Args:
+            app (Flask): The application
+            backend (flask_caching.Cache): Initialized Flask-Caching instance
+                used as L2, or None for an L1-only cache
+        """
+        self.l1 = LRUCache(app.config.get('CACHE_L1_MAX_ITEMS', 2048))
+        self.default_timeout = app.config.get('CACHE_DEFAULT_TIMEOUT', 300)
+        self.salt = app.config.get('HTTP_CACHE_SALT') or ''
+        # Use the backend object directly so lookups work outside an app context
+        self.l2 = app.extensions['cache'][backend] if backend is not None else None
+        app.extensions['tiered_cache'] = self
+
+    def _check_version(self):
+        version = snapshot.version
+        if version != self._version:
+            self.l1.clear()
+            self._version = version
+        return version
+
+    def _count(self, counter):
+        with self._stats_lock:
+            self._stats[counter] += 1
+        metrics.count_cache_lookup(counter)
+
+    def versioned_key(self, key):
+        """Prefix a key with the current dataset version and the salt."""
+        return f"v{self._check_version()}:{self.salt}:{key}"
+
+    def get(self, key, default=None):
+        """Look a versioned key up in L1, then L2 (promoting hits to L1)."""
+        full_key = self.versioned_key(key)
+
+        value = self.l1.get(full_key)
+        if value is not _MISSING:
+            self._count('l1_hits')
+            return value
+
+        if self.l2 is not None:
+            try:
+                # Values are wrapped in a tuple so cached None is a hit
+                wrapped = self.l2.get(full_key)
+            except Exception as e:
+                logger.warning("L2 cache get failed: %s", e)
+                wrapped = None
+            if wrapped is not None:
+                self._count('l2_hits')
+                self.l1.set(full_key, wrapped[0], self.default_timeout)
+                return wrapped[0]
+
+        self._count('misses')
+        return default
+
+    def set(self, key, value, timeout=None):
+        full_key = self.versioned_key(key)
+        timeout = self.default_timeout if timeout is None else timeout
+        self.l1.set(full_key, value, timeout)
+        if self.l2 is not None:
+            try:
+                self.l2.set(full_key, (value,), timeout=timeout)
+            except Exception as e:
+                logger.warning("L2 cache set failed: %s", e)
+
+    def delete(self, key):
+        full_key = self.versioned_key(key)
+        self.l1.delete(full_key)
+        if self.l2 is not None:
+            try:
+                self.l2.delete(full_key)
+            except Exception as e:
+                logger.warning("L2 cache delete failed: %s", e)
+
+    @contextmanager
+    def single_flight(self, key):
+        """
+        Hold a per-key lock for the duration of the block.
+
+        Callers that find a key missing take this lock, look the key up again
+        and only compute the value if it's still missing, so a cold key is
+        computed once however many threads request it at the same time.
+        """
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = [threading.Lock(), 0]
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            with self._flights_lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    def get_or_set(self, key, factory, timeout=None):
+        """
+        Return the cached value of a key, computing and caching it if missing.
+
+        Args:
+            key (str): Cache key (the dataset version is added)
+            factory (callable): Computes the value when it isn't cached
+            timeout (int): Entry lifetime in seconds
+
+        Returns:
+            The cached or computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            with self.single_flight(key):
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = factory()
+                    self.set(key, value, timeout)
+        return value
+
+    def clear(self):
+        self.l1.clear()
+        if self.l2 is not None:
+            self.l2.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current L1 size."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['l1_hits'] + stats['l2_hits']) / lookups if lookups else 0.0
+        stats['l1_items'] = len(self.l1)
+        stats['l1_evictions'] = self.l1.evictions
+        stats['dataset_version'] = self._version
+        return stats
+
+    def memoize(self, timeout=None):
+        """
+        Cache a function's return value per dataset version and arguments.
+
+        Arguments are bound to the function signature with defaults applied,
+        so get_all_pokemon(20), get_all_pokemon(limit=20) and
+        get_all_pokemon(20, 0) share one entry while different limit/skip
+        values never collide.
+        """
+        def decorator(func):
+            signature = inspect.signature(func)
+            name = f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = repr(tuple(bound.arguments.items()))
+                key = f"memo:{name}:{hashlib.sha1(arguments.encode('utf-8')).hexdigest()}"
+
+                return self.get_or_set(key, lambda: func(*args, **kwargs), timeout)
+
+            wrapper.uncached = func
+            return wrapper
+        return decorator
+
+
+# Create a global instance
+tiered_cache = TieredCache()
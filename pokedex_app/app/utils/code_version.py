@@ -0,0 +1,33 @@
+import hashlib
+import os
+
+# Length of the hex digest used in cache keys and ETags
+VERSION_LENGTH = 12
+
+
+def code_version(root_path):
+    """
+    Return a short digest of the app's code and templates.
+
+    Every file under root_path (the app package: routes, utils, templates,
+    ...) is hashed in path order, skipping compiled bytecode, so the value
+    is the same on every server running the same code and changes with any
+    deploy that can change a response.
+
+    Args:
+        root_path (str): Directory to hash, usually app.root_path
+
+    Returns:
+        str: Hex digest of VERSION_LENGTH characters
+    """
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(root_path):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for name in sorted(files):
+            if name.endswith(('.pyc', '.pyo')):
+                continue
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, root_path).replace(os.sep, '/').encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:VERSION_LENGTH]
@@ -0,0 +1,137 @@
+import gzip
+import logging
+
+from flask import request
+
+# brotli and zstandard are optional; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Content types worth compressing
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'text/xml',
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'
+}
+
+
+class Compression:
+    """
+    Negotiated response compression (brotli, zstd or gzip).
+
+    Responses of a compressible type and at least COMPRESS_MIN_SIZE bytes
+    are compressed with the client's preferred encoding among those
+    installed, at the COMPRESS_*_LEVEL of that encoding. Compressed bodies
+    of responses with a strong ETag (the dataset views, see
+    utils/http_cache.py) are kept in the tiered cache under that ETag, so a
+    hot document is compressed once per encoding rather than per request;
+    utils/page_cache.py stores them with its cached pages for the same
+    reason.
+    """
+
+    def __init__(self, app=None, cache=None):
+        self.enabled = True
+        self.min_size = 500
+        self.levels = {'br': 4, 'zstd': 3, 'gzip': 6}
+        self.encodings = ['gzip']
+        self.cache = None
+        if app is not None:
+            self.init_app(app, cache)
+
+    def init_app(self, app, cache=None):
+        """
+        Args:
+            app (Flask): The application
+            cache (TieredCache): Cache for compressed bodies of ETagged
+                responses, or None to compress them on every request
+        """
+        config = app.config
+        self.enabled = config.get('COMPRESS_ENABLED', True)
+        self.min_size = config.get('COMPRESS_MIN_SIZE', 500)
+        self.levels = {
+            'br': config.get('COMPRESS_BR_LEVEL', 4),
+            'zstd': config.get('COMPRESS_ZSTD_LEVEL', 3),
+            'gzip': config.get('COMPRESS_LEVEL', 6)
+        }
+        # Server preference, used when the client rates encodings equally
+        self.encodings = [encoding for encoding, available in (
+            ('br', brotli is not None),
+            ('zstd', zstandard is not None),
+            ('gzip', True)
+        ) if available]
+        self.cache = cache
+
+        app.after_request(self._compress)
+        app.extensions['compression'] = self
+
+    def negotiate(self, mimetype, size):
+        """
+        Return the encoding to send a body of this type and size with, or None.
+
+        Must be called within a request context.
+        """
+        if not self.enabled or size < self.min_size or mimetype not in COMPRESSIBLE_MIMETYPES:
+            return None
+        return request.accept_encodings.best_match(self.encodings)
+
+    def compress(self, data, encoding):
+        """Compress bytes with one of the supported encodings."""
+        level = self.levels[encoding]
+        if encoding == 'br':
+            return brotli.compress(data, quality=level)
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor(level=level).compress(data)
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def _compress(self, response):
+        if not self.enabled or response.direct_passthrough or response.is_streamed:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return response
+
+        if 'Content-Encoding' in response.headers:
+            # Already compressed, e.g. a precompressed cached page
+            self._mark_encoded(response)
+            return response
+
+        body = response.get_data()
+        encoding = self.negotiate(response.mimetype, len(body))
+        if encoding is None:
+            if response.mimetype in COMPRESSIBLE_MIMETYPES and len(body) >= self.min_size:
+                response.vary.add('Accept-Encoding')
+            return response
+
+        etag, weak = response.get_etag()
+        cache_key = f"compressed:{encoding}:{etag}" if etag and not weak and self.cache else None
+        compressed = self.cache.get(cache_key) if cache_key else None
+        if compressed is None:
+            compressed = self.compress(body, encoding)
+            if cache_key:
+                self.cache.set(cache_key, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        self._mark_encoded(response)
+        return response
+
+    @staticmethod
+    def _mark_encoded(response):
+        response.vary.add('Accept-Encoding')
+        # Each encoding is a different byte sequence, so a strong ETag
+        # shared by all of them would be wrong; weak comparison (used for
+        # If-None-Match) still matches
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+
+# Create a global instance
+compression = Compression()
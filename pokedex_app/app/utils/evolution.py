@@ -0,0 +1,115 @@
+import re
+from collections import deque
+
+LEVEL_PATTERN = re.compile(r'^Level (\d+)$')
+
+
+def build_evolution_families(pokemon_by_id):
+    """
+    Group Pokémon into evolution families.
+
+    Both ``evolution.prev`` and every ``evolution.next`` entry are followed,
+    so branching families such as Eevee's are kept whole.
+
+    Args:
+        pokemon_by_id (dict): Pokémon records keyed by Pokédex ID
+
+    Returns:
+        dict: Maps the ID of every Pokémon that evolves or evolves from
+        another to its family. A family is shared by all of its members::
+
+            {
+                'root': 133,
+                'members': [133, 134, 135, ...],   # stage order
+                'chain': [{'id', 'name', 'image', 'stage', 'evolves_from',
+                           'evolution_details', 'evolution_level'}, ...],
+                'tree': {'pokemon': <chain entry of the root>,
+                         'children': [<tree of each direct evolution>, ...]}
+            }
+
+        'chain' lists members stage by stage; 'tree' keeps who evolves
+        into whom, which is what branching families must be drawn from.
+    """
+    parents = {}
+    for pokemon_id, pokemon in pokemon_by_id.items():
+        evolution = pokemon.get('evolution') or {}
+        for next_evo in evolution.get('next', []):
+            child_id = int(next_evo[0])
+            if child_id in pokemon_by_id:
+                parents[child_id] = (pokemon_id, next_evo[1] if len(next_evo) > 1 else None)
+        prev = evolution.get('prev')
+        if prev and int(prev[0]) in pokemon_by_id:
+            parents.setdefault(pokemon_id, (int(prev[0]), prev[1] if len(prev) > 1 else None))
+
+    children = {}
+    for child_id, (parent_id, _) in sorted(parents.items()):
+        children.setdefault(parent_id, []).append(child_id)
+
+    roots = sorted({_find_root(pokemon_id, parents) for pokemon_id in parents})
+
+    families = {}
+    for root_id in roots:
+        # Breadth-first so members are listed stage by stage
+        members = []
+        stages = {root_id: 1}
+        queue = deque([root_id])
+        while queue:
+            pokemon_id = queue.popleft()
+            if pokemon_id in families:
+                continue
+            members.append(pokemon_id)
+            for child_id in children.get(pokemon_id, []):
+                if child_id not in stages:
+                    stages[child_id] = stages[pokemon_id] + 1
+                    queue.append(child_id)
+
+        chain = [
+            _chain_entry(pokemon_by_id[pokemon_id], stages[pokemon_id], parents.get(pokemon_id))
+            for pokemon_id in members
+        ]
+        family = {
+            'root': root_id,
+            'members': members,
+            'chain': chain,
+            'tree': _build_tree(root_id, chain)
+        }
+        for pokemon_id in members:
+            families[pokemon_id] = family
+
+    return families
+
+
+def _find_root(pokemon_id, parents):
+    seen = set()
+    while pokemon_id in parents and pokemon_id not in seen:
+        seen.add(pokemon_id)
+        pokemon_id = parents[pokemon_id][0]
+    return pokemon_id
+
+
+def _build_tree(root_id, chain):
+    """Nest chain entries under the entry they evolve from."""
+    nodes = {entry['id']: {'pokemon': entry, 'children': []} for entry in chain}
+    for entry in chain:
+        parent_id = entry['evolves_from']
+        if parent_id in nodes and entry['id'] != root_id:
+            nodes[parent_id]['children'].append(nodes[entry['id']])
+    return nodes[root_id]
+
+
+def _chain_entry(pokemon, stage, parent):
+    parent_id, trigger = parent if parent else (None, None)
+    level = LEVEL_PATTERN.match(trigger) if trigger else None
+    return {
+        'id': pokemon['id'],
+        'name': pokemon['name']['english'],
+        'image': {
+            'sprite': pokemon['image']['sprite'],
+            'thumbnail': pokemon['image']['thumbnail'],
+            'hires': pokemon['image']['hires']
+        },
+        'stage': stage,
+        'evolves_from': parent_id,
+        'evolution_level': int(level.group(1)) if level else None,
+        'evolution_details': trigger
+    }
@@ -0,0 +1,166 @@
+from pokedex_app.app.utils.search_index import normalize
+
+
+def levenshtein(a, b, max_distance):
+    """
+    Edit distance between two strings, bounded by max_distance.
+
+    Only the diagonal band of width 2 * max_distance + 1 is computed, and
+    max_distance + 1 is returned as soon as the distance is known to exceed
+    the bound.
+    """
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > max_distance:
+        return max_distance + 1
+
+    over = max_distance + 1
+    previous = list(range(len(a) + 1))
+    for i in range(1, len(b) + 1):
+        cb = b[i - 1]
+        low = max(1, i - max_distance)
+        high = min(len(a), i + max_distance)
+        current = [over] * (len(a) + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] if a[j - 1] == cb else previous[j - 1] + 1
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+
+def _deletes(word, max_distance):
+    """Return every string obtained by deleting up to max_distance characters."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class SymSpellIndex:
+    """
+    Symmetric-delete spelling index (the SymSpell algorithm).
+
+    Every word is stored under all strings reachable by deleting up to
+    max_distance characters from its first prefix_length characters. A
+    query generates the same deletes of its own prefix, so candidate words
+    are found with a handful of dict lookups and only those candidates are
+    checked with a bounded edit distance, with no scan over all words.
+    """
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._payloads = {}
+        self._deletes = {}
+
+    def add(self, word, payload):
+        """Add a word with a payload; payloads of equal words are merged."""
+        if word in self._payloads:
+            self._payloads[word].append(payload)
+            return
+        self._payloads[word] = [payload]
+        for delete in _deletes(word[:self.prefix_length], self.max_distance):
+            self._deletes.setdefault(delete, []).append(word)
+
+    def search(self, word, max_distance=None):
+        """
+        Find all words within max_distance edits of word.
+
+        Returns:
+            list: (distance, word, payloads) tuples, closest first
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        candidates = set()
+        for delete in _deletes(word[:self.prefix_length], max_distance):
+            candidates.update(self._deletes.get(delete, ()))
+
+        results = []
+        for candidate in candidates:
+            distance = levenshtein(word, candidate, max_distance)
+            if distance <= max_distance:
+                results.append((distance, candidate, self._payloads[candidate]))
+
+        results.sort(key=lambda result: (result[0], result[1]))
+        return results
+
+    def __len__(self):
+        return len(self._payloads)
+
+
+class FuzzyNameIndex:
+    """
+    Typo-tolerant lookup over Pokémon, move and item names in every
+    language the data provides.
+    """
+
+    def __init__(self, pokemon, moves, items):
+        self._index = SymSpellIndex(max_distance=2)
+        for record in pokemon:
+            for name in (record.get('name') or {}).values():
+                self._add(name, ('pokemon', record['id']))
+        for move in moves:
+            for key in ('ename', 'jname', 'cname'):
+                self._add(move.get(key), ('move', move['id']))
+        for item in items:
+            names = item.get('name') or {}
+            # A few items only have a plain English name
+            for name in names.values() if isinstance(names, dict) else [names]:
+                self._add(name, ('item', item['id']))
+
+    def _add(self, name, payload):
+        if not name:
+            return
+        self._index.add(normalize(name), payload)
+
+    @staticmethod
+    def max_distance_for(word):
+        """Allowed number of edits: 1 for short words, 2 otherwise."""
+        return 1 if len(word) <= 4 else 2
+
+    def search(self, query, limit=10, max_distance=None):
+        """
+        Find names within a bounded edit distance of a query.
+
+        Args:
+            query (str): Possibly misspelled name
+            limit (int): Maximum number of results
+            max_distance (int): Allowed edits, by default based on query length
+
+        Returns:
+            list: (distance, kind, id) tuples ranked by distance, then kind
+            (Pokémon, moves, items) and ID
+        """
+        word = normalize(query.strip())
+        if not word:
+            return []
+        if max_distance is None:
+            max_distance = self.max_distance_for(word)
+
+        best = {}
+        for distance, _, payloads in self._index.search(word, max_distance):
+            for payload in payloads:
+                if distance < best.get(payload, max_distance + 1):
+                    best[payload] = distance
+
+        kind_order = {'pokemon': 0, 'move': 1, 'item': 2}
+        ranked = sorted(
+            ((distance, kind, record_id) for (kind, record_id), distance in best.items()),
+            key=lambda result: (result[0], kind_order[result[1]], result[2])
+        )
+        return ranked[:limit]
@@ -0,0 +1,113 @@
+import functools
+import hashlib
+from datetime import datetime, timezone
+
+from flask import current_app, make_response, request
+
+from pokedex_app.app.models.snapshot import snapshot
+
+
+def dataset_etag(endpoint=None, view_args=None, args=None):
+    """
+    Return a strong ETag for a response of the current dataset version.
+
+    The tag covers the dataset version, the endpoint and its URL and query
+    parameters, so it changes exactly when the response can change.
+
+    Args:
+        endpoint (str): Endpoint name, the current request's by default
+        view_args (dict): URL parameters, the current request's by default
+        args (MultiDict): Query parameters, the current request's by default
+
+    Returns:
+        str: ETag value, without quotes
+    """
+    endpoint = endpoint if endpoint is not None else request.endpoint
+    view_args = view_args if view_args is not None else request.view_args or {}
+    args = args if args is not None else request.args
+
+    parts = [
+        current_app.config.get('HTTP_CACHE_SALT', ''),
+        str(snapshot.version),
+        endpoint or '',
+        repr(sorted(view_args.items())),
+        repr(sorted(args.items(multi=True)))
+    ]
+    return hashlib.sha1('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+
+def dataset_last_modified():
+    """Return when the dataset was last imported, as an aware UTC datetime, or None."""
+    updated_at = snapshot.updated_at
+    if updated_at is None:
+        return None
+    # pymongo returns naive datetimes in UTC
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second precision
+    return updated_at.replace(microsecond=0)
+
+
+def response_last_modified():
+    """
+    Return the Last-Modified of a dataset response, as an aware UTC datetime.
+
+    This is the later of the last import and the deploy
+    (HTTP_CACHE_DEPLOYED_AT), so a copy fetched before either is stale
+    under If-Modified-Since just as its ETag no longer matches.
+    """
+    deployed_at = datetime.fromtimestamp(float(current_app.config['HTTP_CACHE_DEPLOYED_AT']), timezone.utc)
+    deployed_at = deployed_at.replace(microsecond=0)
+    updated_at = dataset_last_modified()
+    return deployed_at if updated_at is None else max(updated_at, deployed_at)
+
+
+def _not_modified(etag, last_modified):
+    """Return whether the request's validators match the current response."""
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return request.if_modified_since >= last_modified
+    return False
+
+
+def _set_cache_headers(response, etag, last_modified):
+    config = current_app.config
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = config.get('HTTP_CACHE_MAX_AGE', 3600)
+    response.cache_control.stale_while_revalidate = config.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 86400)
+
+
+def conditional(view):
+    """
+    Make a GET view that only depends on the dataset answer conditional requests.
+
+    Responses get an ETag and Last-Modified derived from the dataset
+    version and the deploy, and a long public Cache-Control with stale-while-revalidate.
+    Requests whose If-None-Match (or If-Modified-Since) matches are
+    answered with 304 before the view runs, so they never reach the
+    snapshot, MongoDB or Jinja.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not current_app.config.get('HTTP_CACHE_ENABLED', True):
+            return view(*args, **kwargs)
+
+        etag = dataset_etag()
+        last_modified = response_last_modified()
+        if _not_modified(etag, last_modified):
+            response = current_app.response_class(status=304)
+            _set_cache_headers(response, etag, last_modified)
+            return response
+
+        response = make_response(view(*args, **kwargs))
+        # Errors aren't cached; a 404 may become a 200 after the next import
+        if response.status_code == 200:
+            _set_cache_headers(response, etag, last_modified)
+        return response
+
+    return wrapper
@@ -0,0 +1,200 @@
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import before_render_template, request, template_rendered
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+# Figures of the request being handled by the current thread
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Timings collected while handling one request."""
+
+    __slots__ = ('started', 'mongo_commands', 'mongo_seconds', 'render_seconds', '_render_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.mongo_commands = 0
+        self.mongo_seconds = 0.0
+        self.render_seconds = 0.0
+        self._render_started = []
+
+
+class Histogram:
+    """Thread-safe cumulative histogram of durations in milliseconds."""
+
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms):
+        index = bisect.bisect_left(self.buckets, value_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value_ms
+
+    def snapshot(self):
+        """Return count, sum, mean and cumulative bucket counts."""
+        with self._lock:
+            counts, count, total = list(self.counts), self.count, self.sum
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative.append(['+Inf' if bound == float('inf') else bound, running])
+        return {
+            'count': count,
+            'sum_ms': round(total, 3),
+            'mean_ms': round(total / count, 3) if count else 0.0,
+            'buckets': cumulative
+        }
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    Counts and times the Mongo commands of the current request, and logs
+    commands slower than a threshold.
+    """
+
+    def __init__(self, slow_ms=100):
+        self.slow_ms = slow_ms
+        self._commands = {}
+
+    def started(self, event):
+        # Keep a short description for the slow-command log
+        command = event.command
+        self._commands[event.request_id] = (
+            event.command_name,
+            command.get(event.command_name),
+            command.get('filter', command.get('pipeline'))
+        )
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        description = self._commands.pop(event.request_id, None)
+        seconds = event.duration_micros / 1e6
+
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.mongo_commands += 1
+            metrics.mongo_seconds += seconds
+
+        if seconds * 1000 >= self.slow_ms and description:
+            name, collection, query = description
+            logger.warning("Slow Mongo command %s on %s took %.1f ms: %s",
+                           name, collection, seconds * 1000, query)
+
+
+class Instrumentation:
+    """
+    Per-request timing: total latency, template render time and Mongo
+    command count and duration.
+
+    The figures of each request go out in a Server-Timing header and are
+    added to in-process histograms per endpoint. Mongo commands are timed
+    by a CommandListener, which must be passed to the MongoClient (see
+    listeners()).
+    """
+
+    def __init__(self, app=None):
+        self.command_timer = MongoCommandTimer()
+        self.server_timing = True
+        self._histograms = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.command_timer.slow_ms = app.config.get('SLOW_QUERY_MS', 100)
+        self.server_timing = app.config.get('SERVER_TIMING', True)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._reset)
+        before_render_template.connect(self._render_started, app)
+        template_rendered.connect(self._render_finished, app)
+        app.extensions['instrumentation'] = self
+
+    def listeners(self):
+        """Event listeners to pass to MongoClient."""
+        return [self.command_timer]
+
+    def histogram(self, metric, endpoint):
+        key = (metric, endpoint)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        return histogram
+
+    def stats(self):
+        """Return {endpoint: {metric: histogram snapshot}}."""
+        stats = {}
+        for (metric, endpoint), histogram in list(self._histograms.items()):
+            stats.setdefault(endpoint, {})[metric] = histogram.snapshot()
+        return stats
+
+    @staticmethod
+    def current():
+        """Return the RequestMetrics of the current request, or None."""
+        return _current.get()
+
+    def _start(self):
+        _current.set(RequestMetrics())
+
+    def _render_started(self, sender, template, context, **extra):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics._render_started.append(time.perf_counter())
+
+    def _render_finished(self, sender, template, context, **extra):
+        metrics = _current.get()
+        if metrics is not None and metrics._render_started:
+            metrics.render_seconds += time.perf_counter() - metrics._render_started.pop()
+
+    def _finish(self, response):
+        metrics = _current.get()
+        if metrics is None:
+            return response
+
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        mongo_ms = metrics.mongo_seconds * 1000
+        render_ms = metrics.render_seconds * 1000
+
+        endpoint = request.endpoint or 'unmatched'
+        self.histogram('request', endpoint).observe(total_ms)
+        self.histogram('mongo', endpoint).observe(mongo_ms)
+        self.histogram('render', endpoint).observe(render_ms)
+
+        if self.server_timing:
+            response.headers.add('Server-Timing', ', '.join([
+                f'total;dur={total_ms:.2f}',
+                f'mongo;dur={mongo_ms:.2f};desc="{metrics.mongo_commands} commands"',
+                f'render;dur={render_ms:.2f}'
+            ]))
+        return response
+
+    def _reset(self, exc=None):
+        _current.set(None)
+
+
+# Create a global instance
+instrumentation = Instrumentation()
@@ -0,0 +1,84 @@
+import random
+
+# Additional move types to ensure more diversity
+VARIED_TYPES = ["Normal", "Fighting", "Flying", "Psychic", "Ghost", "Dark"]
+
+
+def format_move(move, **extra):
+    """Format a normalized move record for display on the detail page."""
+    formatted = {
+        'id': move.get('id', 0),
+        'name': move.get('ename', 'Unknown'),
+        'type': move.get('type', 'Normal'),
+        'category': move.get('category', 'status').title(),  # Capitalize for display
+        'power': move.get('power') or None,
+        'accuracy': move.get('accuracy') or None,
+        'pp': move.get('pp', 0)
+    }
+    formatted.update(extra)
+    return formatted
+
+
+def build_learnset(pokemon, moves, moves_by_type):
+    """
+    Build the learnset of a Pokémon.
+
+    The dataset has no per-Pokémon move data, so learnsets are derived from
+    the Pokémon's types. Every list is deterministic for a given dataset,
+    which makes the result safe to memoize.
+
+    Args:
+        pokemon (dict): Pokémon record
+        moves (list): All move records in ID order
+        moves_by_type (dict): Move records grouped by type, in ID order
+
+    Returns:
+        dict: Moves organized by how they are learned
+    """
+    learnset = {
+        'level_up': [],  # Moves learned by leveling up
+        'tm_hm': [],     # Moves learned from TMs/HMs
+        'egg': [],       # Egg moves
+        'tutor': [],     # Moves from move tutors
+        'evolution': []  # Moves learned upon evolution
+    }
+
+    pokemon_types = pokemon.get('type', [])
+    move_types = pokemon_types + [t for t in VARIED_TYPES if t not in pokemon_types]
+
+    only_tm_moves = any('tm' in move for move in moves)
+
+    used_ids = set()
+    for move_type in move_types:
+        type_moves = moves_by_type.get(move_type, [])
+
+        # Strongest moves of this type, moves without power last
+        level_moves = sorted(type_moves, key=lambda m: -(m.get('power') or 0))[:3]
+        for move in level_moves:
+            learnset['level_up'].append(format_move(move, level=5 * len(learnset['level_up']) + 5))  # Just a placeholder level
+            used_ids.add(move.get('id'))
+
+        tm_moves = [m for m in type_moves if 'tm' in m] if only_tm_moves else type_moves
+        for move in tm_moves[:2]:
+            learnset['tm_hm'].append(format_move(move, tm=move.get('tm', 0)))
+            used_ids.add(move.get('id'))
+
+    # Tutor moves: remaining moves of the Pokémon's own types
+    tutor_moves = [
+        m for t in pokemon_types for m in moves_by_type.get(t, [])
+        if m.get('id') not in used_ids
+    ]
+    for move in tutor_moves[:3]:
+        learnset['tutor'].append(format_move(move))
+        used_ids.add(move.get('id'))
+
+    # Egg moves: a few moves of other types, picked with a per-Pokémon seed
+    egg_candidates = [
+        m for m in moves
+        if m.get('type') not in pokemon_types and m.get('id') not in used_ids
+    ]
+    rng = random.Random(pokemon['id'])
+    for move in rng.sample(egg_candidates, min(3, len(egg_candidates))):
+        learnset['egg'].append(format_move(move))
+
+    return learnset
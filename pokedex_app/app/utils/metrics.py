@@ -0,0 +1,205 @@
+import logging
+import os
+import threading
+import time
+
+from flask import Response, g, request
+from pymongo import monitoring
+
+# prometheus_client is optional; without it /metrics is not registered
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram, multiprocess
+except ImportError:
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+# TieredCache counters and the (layer, result) labels they map to
+CACHE_LOOKUPS = {
+    'l1_hits': (('l1', 'hit'),),
+    'l2_hits': (('l1', 'miss'), ('l2', 'hit')),
+    'misses': (('l1', 'miss'), ('l2', 'miss'))
+}
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Counts and times Mongo commands by command name and outcome."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.metrics.observe_command(event.command_name, 'success', event.duration_micros / 1e6)
+
+    def failed(self, event):
+        self.metrics.observe_command(event.command_name, 'failure', event.duration_micros / 1e6)
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Times how long requests wait to check a connection out of the pool."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        # Check-outs happen on the requesting thread; older pymongo versions
+        # don't report their duration, so it is measured here
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self.metrics.observe_checkout(self._duration(event), failed=False)
+
+    def connection_check_out_failed(self, event):
+        self.metrics.observe_checkout(self._duration(event), failed=True)
+
+    def _duration(self, event):
+        duration = getattr(event, 'duration', None)
+        if duration is None:
+            started = getattr(self._local, 'started', None)
+            duration = time.perf_counter() - started if started is not None else 0.0
+        return duration
+
+    # The remaining pool events aren't measured
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+class PrometheusMetrics:
+    """
+    Prometheus metrics served at /metrics.
+
+    Covers request latency per endpoint, in-flight requests, Mongo command
+    counts and latency, connection pool check-out waits and TieredCache
+    hits and misses per layer.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (e.g. under gunicorn with several
+    workers), every worker writes its samples to that directory and
+    /metrics aggregates all of them. The directory must be emptied before
+    the server starts, and the server should call
+    prometheus_client.multiprocess.mark_process_dead(pid) when a worker
+    exits.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = prometheus_client is not None
+        if self.enabled:
+            self._create_metrics()
+        self.command_listener = MongoCommandMetrics(self)
+        self.pool_listener = MongoPoolMetrics(self)
+        if app is not None:
+            self.init_app(app)
+
+    def _create_metrics(self):
+        self.request_latency = Histogram(
+            'pokedex_request_duration_seconds', 'Request latency',
+            ['endpoint', 'method', 'status'], buckets=LATENCY_BUCKETS)
+        self.in_flight = Gauge(
+            'pokedex_requests_in_flight', 'Requests being handled',
+            multiprocess_mode='livesum')
+        self.mongo_commands = Counter(
+            'pokedex_mongo_commands_total', 'Mongo commands',
+            ['command', 'outcome'])
+        self.mongo_latency = Histogram(
+            'pokedex_mongo_command_duration_seconds', 'Mongo command latency',
+            ['command'], buckets=LATENCY_BUCKETS)
+        self.pool_wait = Histogram(
+            'pokedex_mongo_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection',
+            buckets=POOL_WAIT_BUCKETS)
+        self.pool_failures = Counter(
+            'pokedex_mongo_pool_checkout_failures_total', 'Failed connection check-outs')
+        self.cache_lookups = Counter(
+            'pokedex_cache_lookups_total', 'Cache lookups by layer and result',
+            ['layer', 'result'])
+
+    def init_app(self, app):
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            logger.info("prometheus_client is not installed, /metrics is disabled")
+            return
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def listeners(self):
+        """Event listeners to pass to MongoClient."""
+        return [self.command_listener, self.pool_listener] if self.enabled else []
+
+    def observe_command(self, command, outcome, seconds):
+        self.mongo_commands.labels(command, outcome).inc()
+        self.mongo_latency.labels(command).observe(seconds)
+
+    def observe_checkout(self, seconds, failed):
+        self.pool_wait.observe(seconds)
+        if failed:
+            self.pool_failures.inc()
+
+    def count_cache_lookup(self, counter):
+        """Record a TieredCache lookup given the counter it incremented."""
+        if self.enabled:
+            for layer, result in CACHE_LOOKUPS[counter]:
+                self.cache_lookups.labels(layer, result).inc()
+
+    def _start(self):
+        g._metrics_started = time.perf_counter()
+        g._metrics_in_flight = True
+        self.in_flight.inc()
+
+    def _finish(self, response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            self.request_latency.labels(
+                request.endpoint or 'unmatched', request.method, response.status_code
+            ).observe(time.perf_counter() - started)
+        return response
+
+    def _teardown(self, exc=None):
+        # Request contexts that never ran _start (test_request_context(), or
+        # an earlier before_request handler raising) were never counted
+        if g.pop('_metrics_in_flight', False):
+            self.in_flight.dec()
+
+    def metrics_view(self):
+        """Serve every metric in the Prometheus text format."""
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus_client.REGISTRY
+        return Response(prometheus_client.generate_latest(registry),
+                        content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+# Create a global instance
+metrics = PrometheusMetrics()
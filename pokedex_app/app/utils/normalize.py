@@ -0,0 +1,141 @@
+# Canonical fields written once at import time. scripts/import_data.py runs
+# every record through these functions, and the snapshot runs them again on
+# load for databases imported by older versions of the script. They are
+# idempotent, so normalized records come out unchanged.
+
+# Map category names to English
+CATEGORY_MAP = {
+    "物理": "physical",
+    "特殊": "special",
+    "变化": "status"
+}
+
+# Source stat names and the keys of the normalized 'stats' field
+STAT_KEYS = (
+    ('HP', 'hp'),
+    ('Attack', 'attack'),
+    ('Defense', 'defense'),
+    ('Sp. Attack', 'special_attack'),
+    ('Sp. Defense', 'special_defense'),
+    ('Speed', 'speed')
+)
+
+MOVE_NAME_KEYS = (('ename', 'english'), ('jname', 'japanese'), ('cname', 'chinese'))
+
+NO_DESCRIPTION = 'No description available'
+
+
+def lowercase_names(names):
+    """Return a {language: lowercase name} dict for a localized name dict or plain name."""
+    if isinstance(names, str):
+        names = {'english': names}
+    return {language: name.lower() for language, name in (names or {}).items() if isinstance(name, str)}
+
+
+def _int_or_none(value):
+    """Return value as an int, or None if it isn't a number."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        return int(value.strip())
+    return None
+
+
+def normalize_stats(pokemon):
+    """
+    Return base stats as {'hp', 'attack', ..., 'speed', 'total'}.
+
+    Stats are read from 'stats' (already normalized or keyed like 'base'),
+    falling back to 'base'. Missing stats count as 0.
+    """
+    source = pokemon.get('stats') or pokemon.get('base') or {}
+    stats = {}
+    for source_key, key in STAT_KEYS:
+        value = source.get(key, source.get(source_key))
+        stats[key] = _int_or_none(value) or 0
+    stats['total'] = sum(stats.values())
+    return stats
+
+
+def _ability(name, is_hidden=False, description=None):
+    return {
+        'name': name,
+        'description': description or NO_DESCRIPTION,
+        'is_hidden': is_hidden
+    }
+
+
+def _is_true(value):
+    return value in (True, 'true', 'True', 1)
+
+
+def parse_abilities(pokemon):
+    """
+    Return a Pokémon's abilities as [{'name', 'description', 'is_hidden'}].
+
+    The dataset stores them as [name, "true"/"false"] pairs in
+    profile.ability; 'abilities' lists (already parsed, or plain names) and
+    {'normal': ..., 'hidden': ...} 'ability' dicts are read too.
+    """
+    abilities = pokemon.get('abilities')
+    if isinstance(abilities, list):
+        return [
+            _ability(a['name'], _is_true(a.get('is_hidden')), a.get('description')) if isinstance(a, dict)
+            else _ability(a)
+            for a in abilities
+            if isinstance(a, str) or (isinstance(a, dict) and a.get('name'))
+        ]
+
+    ability = pokemon.get('ability')
+    if isinstance(ability, dict):
+        normal = ability.get('normal') or []
+        parsed = [_ability(name) for name in ([normal] if isinstance(normal, str) else normal)]
+        if ability.get('hidden'):
+            parsed.append(_ability(ability['hidden'], True))
+        return parsed
+    if isinstance(ability, list):
+        return [_ability(name) for name in ability if isinstance(name, str)]
+
+    profile_ability = (pokemon.get('profile') or {}).get('ability')
+    if isinstance(profile_ability, str):
+        return [_ability(profile_ability)]
+    parsed = []
+    for entry in profile_ability or []:
+        if isinstance(entry, (list, tuple)) and len(entry) == 2:
+            parsed.append(_ability(entry[0], _is_true(entry[1])))
+        elif isinstance(entry, str):
+            parsed.append(_ability(entry))
+    return parsed
+
+
+def normalize_pokemon(pokemon):
+    """Add 'name_lower', 'stats' and 'abilities' to a Pokémon record, in place."""
+    pokemon['name_lower'] = lowercase_names(pokemon.get('name'))
+    pokemon['stats'] = normalize_stats(pokemon)
+    pokemon['abilities'] = parse_abilities(pokemon)
+    return pokemon
+
+
+def normalize_move(move):
+    """
+    Give a move record an English 'category', integer (or None) 'power' and
+    'accuracy', and a 'name_lower' dict, in place.
+    """
+    category = move.get('category') or ''
+    move['category'] = CATEGORY_MAP.get(category, category.lower() or 'status')
+    move['power'] = _int_or_none(move.get('power'))
+    move['accuracy'] = _int_or_none(move.get('accuracy'))
+    move['name_lower'] = {
+        language: move[key].lower() for key, language in MOVE_NAME_KEYS if isinstance(move.get(key), str)
+    }
+    return move
+
+
+def normalize_item(item):
+    """Add a 'name_lower' dict to an item record, in place."""
+    item['name_lower'] = lowercase_names(item.get('name'))
+    return item
@@ -0,0 +1,118 @@
+import functools
+import hashlib
+
+from flask import current_app, make_response, request
+from markupsafe import Markup
+
+from pokedex_app.app.utils.cache import tiered_cache
+from pokedex_app.app.utils.compression import compression
+
+
+def page_key(endpoint, view_args, args, params=(), defaults=None):
+    """
+    Build the cache key of a rendered page.
+
+    Only the query parameters the view reads are part of the key, and blank
+    values or values equal to the view's default are dropped, so
+    /pokemon/?page=1&utm_source=x shares its entry with /pokemon/.
+
+    Args:
+        endpoint (str): Endpoint name
+        view_args (dict): URL parameters
+        args (MultiDict): Query parameters
+        params (tuple): Query parameters the view reads
+        defaults (dict): Default value of some of those parameters
+
+    Returns:
+        str: Cache key (the dataset version is added by the cache)
+    """
+    defaults = defaults or {}
+    normalized = sorted(
+        (name, value)
+        for name in params
+        for value in args.getlist(name)
+        if value.strip() and value != defaults.get(name)
+    )
+    signature = repr((sorted((view_args or {}).items()), normalized))
+    return f"page:{endpoint}:{hashlib.sha1(signature.encode('utf-8')).hexdigest()}"
+
+
+def cached_page(params=(), defaults=None):
+    """
+    Cache the rendered output of a view that only depends on its URL and the dataset.
+
+    Successful responses are stored per endpoint, URL parameters, normalized
+    query parameters (see page_key) and dataset version, and served from the
+    cache until the next import. A cold page is rendered once per process
+    even when many requests for it arrive together; the others wait and get
+    the cached copy. Compressed copies are stored in the same entry, one per
+    encoding clients ask for.
+
+    Args:
+        params (tuple): Query parameters the view reads
+        defaults (dict): Default value of some of those parameters
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            if request.method not in ('GET', 'HEAD') or not config.get('PAGE_CACHE_ENABLED', True):
+                return view(*args, **kwargs)
+
+            key = page_key(request.endpoint, request.view_args, request.args, params, defaults)
+            page = tiered_cache.get(key)
+            if page is None:
+                with tiered_cache.single_flight(key):
+                    page = tiered_cache.get(key)
+                    if page is None:
+                        response = make_response(view(*args, **kwargs))
+                        # Only complete, successful pages are cached
+                        if response.status_code != 200 or response.is_streamed:
+                            return response
+                        page = {'body': response.get_data(), 'mimetype': response.mimetype, 'encoded': {}}
+                        tiered_cache.set(key, page, timeout=config.get('PAGE_CACHE_TIMEOUT'))
+
+            return _page_response(key, page)
+
+        # Lets the warm-up pick out the views whose output is cached
+        wrapper.page_cached = True
+        return wrapper
+    return decorator
+
+
+def _page_response(key, page):
+    """Build the response of a cached page, compressed if the client accepts it."""
+    encoding = compression.negotiate(page['mimetype'], len(page['body']))
+    if encoding is None:
+        return current_app.response_class(page['body'], mimetype=page['mimetype'])
+
+    encoded = page.get('encoded', {})
+    body = encoded.get(encoding)
+    if body is None:
+        body = compression.compress(page['body'], encoding)
+        # Entries may be shared between threads, so store an updated copy
+        page = dict(page, encoded=dict(encoded, **{encoding: body}))
+        tiered_cache.set(key, page, timeout=current_app.config.get('PAGE_CACHE_TIMEOUT'))
+
+    response = current_app.response_class(body, mimetype=page['mimetype'])
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def fragment(template_name, key, **context):
+    """
+    Render a partial template, cached per key and dataset version.
+
+    Used from templates for pieces shared by many pages, e.g.
+    {{ fragment('partials/type_filter.html', type_filter, types=types) }}.
+    The key must cover everything in the context that changes the output.
+
+    Returns:
+        Markup: The rendered fragment
+    """
+    def render():
+        # Rendered directly so the fragment isn't timed as a separate template
+        return current_app.jinja_env.get_template(template_name).render(**context)
+
+    cache_key = f"fragment:{template_name}:{key!r}"
+    return Markup(tiered_cache.get_or_set(cache_key, render, current_app.config.get('PAGE_CACHE_TIMEOUT')))
@@ -0,0 +1,91 @@
+import base64
+
+
+def encode_cursor(last_id):
+    """Encode the ID of the last record on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode('ascii')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, _, value = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii').partition(':')
+    except (ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+    if prefix != 'id' or not value.lstrip('-').isdigit():
+        raise ValueError('Invalid cursor')
+    return int(value)
+
+
+def keyset_page(records, after_id, limit):
+    """
+    Return the page of records that follows after_id.
+
+    Records must be sorted by their 'id' field. The start of the page is
+    found by binary search, so every page costs the same as the first.
+
+    Args:
+        records (list): Records sorted by ID
+        after_id (int): ID of the last record on the previous page, or None
+        limit (int): Page size
+
+    Returns:
+        tuple: (page records, cursor for the next page or None)
+    """
+    start = 0
+    if after_id is not None:
+        low, high = 0, len(records)
+        while low < high:
+            mid = (low + high) // 2
+            if records[mid]['id'] <= after_id:
+                low = mid + 1
+            else:
+                high = mid
+        start = low
+
+    page = records[start:start + limit]
+    next_cursor = encode_cursor(page[-1]['id']) if page and start + limit < len(records) else None
+    return page, next_cursor
+
+
+def paginate(records, per_page, page=1, after=None):
+    """
+    Slice a list of ID-sorted records by page number or by cursor.
+
+    When a cursor is given it takes precedence over the page number and
+    the returned 'page' is None.
+
+    Args:
+        records (list): Records sorted by ID
+        per_page (int): Page size
+        page (int): 1-based page number for offset pagination
+        after (str): Cursor from a previous response for keyset pagination
+
+    Returns:
+        tuple: (page records, pagination dict)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    total = len(records)
+    if after:
+        page = None
+        page_records, next_cursor = keyset_page(records, decode_cursor(after), per_page)
+    else:
+        skip = (page - 1) * per_page
+        page_records = records[skip:skip + per_page]
+        next_cursor = encode_cursor(page_records[-1]['id']) if page_records and skip + per_page < total else None
+
+    return page_records, {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'total_pages': (total + per_page - 1) // per_page,
+        'next_cursor': next_cursor
+    }
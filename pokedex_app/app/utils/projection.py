@@ -0,0 +1,81 @@
+from functools import lru_cache
+
+# Named field sets for the 'fields' query parameter
+FIELD_PRESETS = {
+    'card': ('id', 'name.english', 'type', 'image.sprite'),
+    'summary': ('id', 'name', 'type', 'generation', 'base', 'image.sprite'),
+    'detail': ('id', 'name', 'type', 'generation', 'base', 'species', 'description',
+               'evolution', 'profile', 'image', 'type_effectiveness')
+}
+
+# Fields derived by utils/normalize.py for templates and the app's own
+# lookups; API responses keep the dataset's shape ('base', profile.ability)
+INTERNAL_FIELDS = frozenset({'name_lower', 'stats', 'abilities'})
+
+
+@lru_cache(maxsize=256)
+def parse_fields(fields):
+    """
+    Turn a 'fields' query parameter into a projection tree.
+
+    The value is a comma-separated list of dotted paths and/or preset names,
+    e.g. "card", "id,name.english" or "card,generation".
+
+    Args:
+        fields (str): The raw parameter value, or None
+
+    Returns:
+        dict: Nested dict with True at each selected leaf, e.g.
+        {'id': True, 'name': {'english': True}}, or None to select every
+        public field
+    """
+    if not fields:
+        return None
+
+    tree = {}
+    for field in fields.split(','):
+        field = field.strip()
+        for path in FIELD_PRESETS.get(field, (field,) if field else ()):
+            node = tree
+            parts = path.split('.')
+            for part in parts[:-1]:
+                child = node.get(part)
+                if child is True:
+                    break  # A parent path is already fully selected
+                node = node.setdefault(part, {})
+            else:
+                node[parts[-1]] = True
+    for field in INTERNAL_FIELDS:
+        tree.pop(field, None)
+    return tree or None
+
+
+def wants(tree, field):
+    """Return True if a top-level field is selected by a projection tree."""
+    return tree is None or field in tree
+
+
+def project(document, tree):
+    """
+    Return a copy of document containing only the fields in a projection tree.
+
+    Fields that don't exist in the document are skipped. Trees from
+    parse_fields() never select INTERNAL_FIELDS, and they are left out of
+    whole documents too.
+    """
+    if tree is None:
+        return {key: value for key, value in document.items() if key not in INTERNAL_FIELDS}
+    return _project(document, tree)
+
+
+def _project(document, tree):
+    result = {}
+    for key, selection in tree.items():
+        if key not in document:
+            continue
+        value = document[key]
+        if selection is True:
+            result[key] = value
+        elif isinstance(value, dict):
+            result[key] = _project(value, selection)
+    return result
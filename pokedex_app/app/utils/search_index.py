@@ -0,0 +1,102 @@
+import unicodedata
+from bisect import bisect_left
+
+NAME_LANGUAGES = ('english', 'japanese', 'chinese', 'french')
+
+# Substring postings are kept for n-grams up to this length
+MAX_GRAM = 3
+
+# Ranks, lower is better
+EXACT, PREFIX, SUBSTRING = 0, 1, 2
+
+
+def normalize(text):
+    """Case-fold a name and strip accents, so 'Évoli' matches 'evoli'."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NameSearchIndex:
+    """
+    In-memory index over the localized names of every Pokémon.
+
+    Prefix matches are found by binary search over the sorted names, and
+    substring matches through n-gram postings (1- to 3-grams) whose
+    candidates are then verified. Results are ranked exact > prefix >
+    substring, then by Pokédex ID.
+    """
+
+    def __init__(self, pokemon, languages=NAME_LANGUAGES):
+        entries = set()
+        for record in pokemon:
+            names = record.get('name') or {}
+            for language in languages:
+                if names.get(language):
+                    entries.add((normalize(names[language]), record['id']))
+
+        self._entries = sorted(entries)
+        self._names = [name for name, _ in self._entries]
+        self._ids = {pokemon_id for _, pokemon_id in self._entries}
+
+        self._postings = {}
+        for position, (name, _) in enumerate(self._entries):
+            for size in range(1, MAX_GRAM + 1):
+                for gram in _grams(name, size):
+                    self._postings.setdefault(gram, []).append(position)
+
+    def search(self, query, limit=10):
+        """
+        Find Pokémon whose name matches a query in any indexed language.
+
+        Args:
+            query (str): Name fragment or Pokédex ID
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Pokédex IDs, best match first
+        """
+        needle = normalize(query.strip())
+        if not needle:
+            return []
+
+        ranks = {}
+
+        if needle.isdigit() and int(needle) in self._ids:
+            ranks[int(needle)] = EXACT
+
+        # Exact and prefix matches are a contiguous run of the sorted names
+        position = bisect_left(self._names, needle)
+        while position < len(self._names) and self._names[position].startswith(needle):
+            name, pokemon_id = self._entries[position]
+            rank = EXACT if name == needle else PREFIX
+            if rank < ranks.get(pokemon_id, SUBSTRING + 1):
+                ranks[pokemon_id] = rank
+            position += 1
+
+        for position in self._substring_candidates(needle):
+            name, pokemon_id = self._entries[position]
+            if pokemon_id not in ranks and needle in name:
+                ranks[pokemon_id] = SUBSTRING
+
+        ranked = sorted(ranks.items(), key=lambda item: (item[1], item[0]))
+        return [pokemon_id for pokemon_id, _ in ranked[:limit]]
+
+    def _substring_candidates(self, needle):
+        if len(needle) <= MAX_GRAM:
+            return self._postings.get(needle, [])
+
+        # Intersect the postings of every trigram, rarest first
+        postings = sorted(
+            (self._postings.get(gram, []) for gram in _grams(needle, MAX_GRAM)),
+            key=len
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
@@ -0,0 +1,71 @@
+import json
+from datetime import date, datetime
+
+from bson import ObjectId
+from flask import Response
+
+# orjson is optional; it is several times faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Encode the BSON and Python types that JSON has no native form for."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def strip_ids(data):
+    """
+    Drop MongoDB '_id' keys from documents in a response payload.
+
+    Only the shapes API responses use are walked: a document, a list of
+    documents, or an envelope dict whose values are documents or lists of
+    documents. Nested fields inside documents are left alone.
+    """
+    if isinstance(data, list):
+        return [_strip_document(item) for item in data]
+    if isinstance(data, dict):
+        data = _strip_document(data)
+        return {
+            key: [_strip_document(item) for item in value] if isinstance(value, list)
+            else _strip_document(value)
+            for key, value in data.items()
+        }
+    return data
+
+
+def _strip_document(document):
+    if isinstance(document, dict) and '_id' in document:
+        return {key: value for key, value in document.items() if key != '_id'}
+    return document
+
+
+def dumps(data, strip_id=True):
+    """
+    Encode data as UTF-8 JSON bytes in a single pass.
+
+    Args:
+        data: Documents, lists or plain values to encode
+        strip_id (bool): Drop MongoDB '_id' keys first (see strip_ids)
+
+    Returns:
+        bytes: The encoded JSON
+    """
+    if strip_id:
+        data = strip_ids(data)
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(data, status=200, strip_id=True):
+    """Build a JSON response without the jsonify/json_util round trips."""
+    return Response(dumps(data, strip_id=strip_id), status=status, mimetype='application/json')
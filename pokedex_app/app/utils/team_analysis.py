@@ -0,0 +1,194 @@
+import numpy as np
+
+from pokedex_app.app.models.snapshot import snapshot
+from pokedex_app.app.utils.type_chart import type_chart
+
+# Largest team the analysis accepts
+MAX_TEAM_SIZE = 6
+
+# A weakness is "stacked" when at least this many members share it and
+# fewer members resist it
+STACK_THRESHOLD = 2
+
+
+def resolve_member(member):
+    """
+    Look up the Pokémon and damaging move types of a team member.
+
+    Members may be a Pokédex ID, a {'id': ..., 'moves': [...]} dict, or a
+    session entry holding the whole Pokémon document under 'pokemon'. Moves
+    may be move IDs or move dicts with an 'id' or a 'type'.
+
+    Returns:
+        tuple: (pokemon record, list of attacking type indices), or
+        (None, []) when the Pokémon doesn't exist
+    """
+    if isinstance(member, dict):
+        pokemon_id = member.get('id', member.get('pokemon_id'))
+        if pokemon_id is None and isinstance(member.get('pokemon'), dict):
+            pokemon_id = member['pokemon'].get('id')
+        moves = member.get('moves') or []
+    else:
+        pokemon_id, moves = member, []
+
+    try:
+        pokemon = snapshot.get_pokemon(int(pokemon_id))
+    except (TypeError, ValueError):
+        pokemon = None
+    if not pokemon:
+        return None, []
+
+    attack_types = []
+    for move in moves:
+        move_type = _damaging_move_type(move)
+        if move_type in type_chart.index:
+            attack_types.append(type_chart.index[move_type])
+    return pokemon, attack_types
+
+
+def _damaging_move_type(move):
+    """Return the type of a damaging move, or None for status or unknown moves."""
+    if isinstance(move, dict):
+        record = snapshot.get_move(move['id']) if move.get('id') is not None else None
+        if record is None:
+            record = move
+    else:
+        try:
+            record = snapshot.get_move(int(move))
+        except (TypeError, ValueError):
+            return None
+    if not record:
+        return None
+
+    if (record.get('category') or '').lower() == 'status':
+        return None
+    return record.get('type')
+
+
+def analyze_teams(teams):
+    """
+    Analyze the type matchups of many teams in one call.
+
+    The defensive rows of every member of every team are gathered from the
+    precomputed combination matrix in a single lookup; each team's counts
+    and coverage are then a few array reductions.
+
+    Args:
+        teams (list): Teams, each a list of members (see resolve_member)
+
+    Returns:
+        list: One analysis dict per team, in order (see analyze_team)
+    """
+    resolved = [[resolve_member(member) for member in team[:MAX_TEAM_SIZE]] for team in teams]
+
+    rows = type_chart.batch_multipliers([
+        pokemon['type'] for team in resolved for pokemon, _ in team if pokemon
+    ])
+
+    analyses = []
+    start = 0
+    for team, members in zip(teams, resolved):
+        found = [(pokemon, attacks) for pokemon, attacks in members if pokemon]
+        analysis = _analyze(found, rows[start:start + len(found)])
+        analysis['missing'] = [member for member, (pokemon, _) in zip(team, members) if not pokemon]
+        analyses.append(analysis)
+        start += len(found)
+    return analyses
+
+
+def analyze_team(members):
+    """
+    Analyze the type matchups of one team.
+
+    Args:
+        members (list): Team members (see resolve_member)
+
+    Returns:
+        dict: 'members' (per-member effectiveness), 'defense' (how many
+        members are weak to, resist or are immune to each attacking type,
+        plus stacked weaknesses), 'offense' (the best multiplier the team's
+        damaging moves reach against each defending type) and 'missing'
+        (members that couldn't be resolved)
+    """
+    return analyze_teams([members])[0]
+
+
+def _analyze(members, rows):
+    names = type_chart.names
+
+    weak = (rows > 1).sum(axis=0)
+    resistant = ((rows > 0) & (rows < 1)).sum(axis=0)
+    immune = (rows == 0).sum(axis=0)
+    stacked = np.flatnonzero((weak >= STACK_THRESHOLD) & (weak > resistant + immune))
+    stacked = sorted(stacked, key=lambda i: -weak[i])
+
+    member_summaries = []
+    for pokemon, _ in members:
+        summary = type_chart.effectiveness(pokemon['type'])
+        summary.update({
+            'id': pokemon['id'],
+            'name': pokemon['name']['english'],
+            'types': pokemon['type']
+        })
+        member_summaries.append(summary)
+
+    return {
+        'members': member_summaries,
+        'defense': {
+            'weaknesses': _counts(names, weak),
+            'resistances': _counts(names, resistant),
+            'immunities': _counts(names, immune),
+            'stacked_weaknesses': [names[i] for i in stacked]
+        },
+        'offense': _coverage(members)
+    }
+
+
+def _counts(names, counts):
+    """Return a {type: count} dict of the non-zero counts, largest first."""
+    order = np.argsort(-counts, kind='stable')
+    return {names[i]: int(counts[i]) for i in order if counts[i]}
+
+
+def _coverage(members):
+    """
+    Offensive coverage of a team.
+
+    Uses the selected damaging moves, or each member's own types (STAB) when
+    no damaging move has been chosen yet.
+    """
+    attack_types = sorted({a for _, attacks in members for a in attacks})
+    source = 'moves'
+    if not attack_types:
+        attack_types = sorted({type_chart.index[t] for pokemon, _ in members
+                               for t in pokemon['type'] if t in type_chart.index})
+        source = 'stab'
+
+    coverage = {
+        'source': source,
+        'attacking_types': [type_chart.names[a] for a in attack_types],
+        'super_effective': [],
+        'neutral': [],
+        'not_very_effective': [],
+        'no_effect': [],
+        'combo_coverage': 0.0
+    }
+    if not attack_types:
+        return coverage
+
+    # Best multiplier against each single type, and against every single
+    # and dual type combination
+    best = type_chart.matrix[attack_types].max(axis=0)
+    best_vs_combos = type_chart.combo_matrix[:, attack_types].max(axis=1)
+
+    for name, multiplier in zip(type_chart.names, best.tolist()):
+        if multiplier > 1:
+            coverage['super_effective'].append(name)
+        elif multiplier == 1:
+            coverage['neutral'].append(name)
+        elif multiplier > 0:
+            coverage['not_very_effective'].append(name)
+        else:
+            coverage['no_effect'].append(name)
+    coverage['combo_coverage'] = round(float((best_vs_combos > 1).mean()), 3)
+    return coverage
@@ -0,0 +1,157 @@
+import json
+import os
+from itertools import combinations
+
+import numpy as np
+
+# Repository root, used to resolve a relative POKEMON_DATA_PATH
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def resolve_data_path(app, filename):
+    """Return the absolute path of a file inside POKEMON_DATA_PATH."""
+    data_path = app.config.get('POKEMON_DATA_PATH', 'pokemon-data.json')
+    if not os.path.isabs(data_path):
+        data_path = os.path.join(ROOT_DIR, data_path)
+    return os.path.join(data_path, filename)
+
+
+class TypeChart:
+    """
+    Type-effectiveness engine backed by a NumPy multiplier matrix.
+
+    ``matrix[a, d]`` is the damage multiplier of attacking type ``a`` against
+    defending type ``d``. The defensive multipliers of every single and dual
+    type combination (18 + 153 = 171 rows) are precomputed in
+    ``combo_matrix``, so looking up a Pokémon's effectiveness is a single
+    row read.
+    """
+
+    def __init__(self, types_data=None):
+        self.names = []
+        self.index = {}
+        self.matrix = np.ones((0, 0), dtype=np.float32)
+        self.combos = []
+        self.combo_index = {}
+        self.combo_matrix = np.ones((0, 0), dtype=np.float32)
+        self._summaries = []
+        if types_data is not None:
+            self.load(types_data)
+
+    def init_app(self, app):
+        with open(resolve_data_path(app, 'types.json'), 'r', encoding='utf-8') as f:
+            self.load(json.load(f))
+        app.extensions['type_chart'] = self
+
+    def load(self, types_data):
+        """Build the multiplier matrix and combination table from types.json data."""
+        names = [t['english'] for t in types_data]
+        index = {name: i for i, name in enumerate(names)}
+
+        matrix = np.ones((len(names), len(names)), dtype=np.float32)
+        for attacking in types_data:
+            a = index[attacking['english']]
+            for defending in attacking.get('effective', []):
+                if defending in index:
+                    matrix[a, index[defending]] = 2.0
+            for defending in attacking.get('ineffective', []):
+                if defending in index:
+                    matrix[a, index[defending]] = 0.5
+            for defending in attacking.get('no_effect', []):
+                if defending in index:
+                    matrix[a, index[defending]] = 0.0
+
+        combos = [(i,) for i in range(len(names))]
+        combos.extend(combinations(range(len(names)), 2))
+
+        # Column products give the multiplier of every attacking type
+        # against each combination
+        combo_matrix = np.ones((len(combos), len(names)), dtype=np.float32)
+        for row, combo in enumerate(combos):
+            for d in combo:
+                combo_matrix[row] *= matrix[:, d]
+
+        self.names = names
+        self.index = index
+        self.matrix = matrix
+        self.combos = combos
+        self.combo_index = {combo: row for row, combo in enumerate(combos)}
+        self.combo_matrix = combo_matrix
+        self._summaries = [self._summarize(combo_matrix[row]) for row in range(len(combos))]
+
+    def combo_row(self, pokemon_types):
+        """
+        Return the combo_matrix row for a list of type names.
+
+        Unknown type names are ignored. Returns None when no known type is
+        given.
+        """
+        if not pokemon_types or isinstance(pokemon_types, str):
+            return None
+        key = tuple(sorted({self.index[t] for t in pokemon_types if t in self.index}))
+        return self.combo_index.get(key)
+
+    def multipliers(self, pokemon_types):
+        """Return a {attacking type: multiplier} dict for the given types."""
+        row = self.combo_row(pokemon_types)
+        if row is None:
+            return {name: 1.0 for name in self.names}
+        return dict(zip(self.names, self.combo_matrix[row].tolist()))
+
+    def batch_multipliers(self, type_lists):
+        """
+        Compute defensive multipliers for many type combinations at once.
+
+        Args:
+            type_lists (list): List of type-name lists, one per Pokémon
+
+        Returns:
+            numpy.ndarray: (len(type_lists), 18) array of multipliers, one row
+            per input in the same order. Inputs without a known type get a
+            row of ones.
+        """
+        rows = [self.combo_row(types) for types in type_lists]
+        result = np.ones((len(rows), len(self.names)), dtype=np.float32)
+        known = [i for i, row in enumerate(rows) if row is not None]
+        if known:
+            result[known] = self.combo_matrix[[rows[i] for i in known]]
+        return result
+
+    def effectiveness(self, pokemon_types):
+        """
+        Return the immune/resistant/weak/super_weak summary for a type combination.
+        """
+        row = self.combo_row(pokemon_types)
+        if row is None:
+            return self._empty_summary()
+        return {category: list(names) for category, names in self._summaries[row].items()}
+
+    def batch_effectiveness(self, type_lists):
+        """Return effectiveness summaries for many type combinations, in order."""
+        return [self.effectiveness(types) for types in type_lists]
+
+    def _summarize(self, multipliers):
+        summary = self._empty_summary()
+        for name, multiplier in zip(self.names, multipliers.tolist()):
+            if multiplier == 0:
+                summary['immune'].append(name)
+            elif multiplier < 1:
+                summary['resistant'].append(name)
+            elif multiplier >= 4:
+                summary['super_weak'].append(name)
+            elif multiplier > 1:
+                summary['weak'].append(name)
+        return summary
+
+    @staticmethod
+    def _empty_summary():
+        return {
+            'immune': [],
+            'resistant': [],
+            'weak': [],
+            'super_weak': []  # For 4x weakness
+        }
+
+
+# Create a global instance
+type_chart = TypeChart()
@@ -17,10 +17,48 @@ class Config:
     # MongoDB settings
     MONGO_URI = os.environ.get('MONGO_URI', 'mongodb://localhost:27017/')
     MONGO_DB_NAME = os.environ.get('MONGO_DB_NAME', 'pokedex_db')
+    # Explain registered query shapes at startup and warn about COLLSCANs.
+    # Off by default: it blocks startup while MongoDB is unreachable; run
+    # `flask indexes check` after deploys instead
+    INDEX_CHECK_ON_STARTUP = os.environ.get('INDEX_CHECK_ON_STARTUP', 'False').lower() == 'true'
     
     # Cache settings
     CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')
     CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 300))
+    CACHE_L1_MAX_ITEMS = int(os.environ.get('CACHE_L1_MAX_ITEMS', 2048))
+    # Rendered pages only change with the dataset version, which is part of the key
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'True').lower() == 'true'
+    PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 3600))
+    
+    # HTTP caching of dataset pages (ETag/Last-Modified and Cache-Control)
+    HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', 'True').lower() == 'true'
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 3600))
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 86400))
+    # Part of every ETag and cache key, so responses cached by clients, CDNs
+    # and a shared Redis aren't reused across deploys. Defaults to a digest
+    # of the app's code and templates (see utils/code_version.py)
+    HTTP_CACHE_SALT = os.environ.get('HTTP_CACHE_SALT')
+    # Unix time of the deploy, the lower bound of every Last-Modified so
+    # If-Modified-Since revalidation also misses across deploys. Defaults to
+    # when the app started
+    HTTP_CACHE_DEPLOYED_AT = os.environ.get('HTTP_CACHE_DEPLOYED_AT')
+    
+    # Response compression (br and zstd need the brotli and zstandard packages)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true'
+    # Smaller responses are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', 4))
+    COMPRESS_ZSTD_LEVEL = int(os.environ.get('COMPRESS_ZSTD_LEVEL', 3))
+    
+    # Instrumentation settings
+    # Send per-request total, Mongo and render timings in a Server-Timing header
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', 'True').lower() == 'true'
+    # Log Mongo commands slower than this many milliseconds
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    
+    # In-memory snapshot settings (seconds between dataset version checks)
+    SNAPSHOT_REFRESH_INTERVAL = int(os.environ.get('SNAPSHOT_REFRESH_INTERVAL', 30))
     
     # Session settings
     SESSION_TYPE = 'filesystem'
@@ -30,6 +68,8 @@ class Config:
     
     # API settings
     JSON_SORT_KEYS = False
+    API_BATCH_MAX_IDS = int(os.environ.get('API_BATCH_MAX_IDS', 500))
+    API_BATCH_MAX_TEAMS = int(os.environ.get('API_BATCH_MAX_TEAMS', 100))
     
     # Path to Pokemon data JSON files
     POKEMON_DATA_PATH = os.environ.get('POKEMON_DATA_PATH', 'pokemon-data.json')
@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to sys.path
+parent_dir = str(Path(__file__).resolve().parent.parent.parent)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from pokedex_app.app import create_app
+from pokedex_app.app.services.static_export import DatasetChangedError, export_site
+
+
+def main():
+    """Export the site to static files; same as `flask export`."""
+    parser = argparse.ArgumentParser(description='Render every dataset page and API document to static files.')
+    parser.add_argument('output_dir', nargs='?', default='export', help='Export directory (default: export)')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--full', action='store_true', help='Re-export every page, not only changed ones')
+    args = parser.parse_args()
+
+    app = create_app()
+    print(f"Exporting to {args.output_dir}...")
+    try:
+        report = export_site(app, args.output_dir, processes=args.processes, full=args.full)
+    except DatasetChangedError as e:
+        print(e)
+        sys.exit(1)
+    print(f"{report['rendered']} pages rendered, {report['unchanged']} unchanged, "
+          f"{report['deleted']} deleted, {report['bytes']} bytes written in {report['seconds']}s")
+    for url, status in report['errors'][:20]:
+        print(f"  {status} {url}")
+    sys.exit(1 if report['errors'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
+import hashlib
 import json
 import os
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, ReplaceOne
 
 # Add parent directory to sys.path
 parent_dir = str(Path(__file__).resolve().parent.parent.parent)
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
+from pokedex_app.app.models.indexes import INDEXES, ensure_indexes
+from pokedex_app.app.utils.normalize import normalize_pokemon, normalize_move, normalize_item
+
 # MongoDB connection settings
 MONGO_URI = os.environ.get('MONGO_URI', 'mongodb://localhost:27017/')
 DB_NAME = os.environ.get('MONGO_DB_NAME', 'pokedex_db')
@@ -26,6 +31,139 @@ types_collection = db['types']
 moves_collection = db['moves']
 items_collection = db['items']
 generations_collection = db['generations']
+meta_collection = db['meta']
+
+# Records are written in bulk_write batches of this size
+BATCH_SIZE = 500
+
+# Field holding a hash of each record's content, used to skip unchanged records
+HASH_FIELD = '_hash'
+
+def iter_json_array(path, chunk_size=65536):
+    """
+    Yield the elements of a JSON array file one at a time.
+    
+    The file is read in chunks, so only the current element and one chunk
+    are held in memory instead of the whole parsed file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        # Skip leading whitespace, which may span several chunks
+        buffer = ''
+        while not buffer:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = chunk.lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} does not contain a JSON array")
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            if buffer.startswith(']'):
+                return
+            try:
+                record, end = decoder.raw_decode(buffer)
+                # A number at the end of the buffer may continue in the next chunk
+                complete = eof or end < len(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                # The element continues past the end of the buffer
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield record
+            buffer = buffer[end:]
+
+def content_hash(record):
+    """Return a stable hash of a record's content."""
+    encoded = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+def sync_collection(name, records, key='id'):
+    """
+    Bring a collection in line with a stream of records without downtime.
+    
+    Records whose content hash matches the live collection are skipped.
+    On the first difference the live collection is copied to a shadow
+    collection, changed records are upserted into it in batches and records
+    that are gone are deleted. The shadow collection is then indexed and
+    renamed over the live one in one atomic step, so readers never see a
+    partial collection. When nothing changed the live collection is left
+    untouched.
+    
+    Args:
+        name (str): Collection name
+        records (iterable): Records to import
+        key (str): Field that identifies a record
+    
+    Returns:
+        int: Number of records upserted or deleted
+    """
+    live = db[name]
+    shadow = db[f'{name}_shadow']
+    existing = {
+        doc[key]: doc.get(HASH_FIELD)
+        for doc in live.find({}, {key: 1, HASH_FIELD: 1, '_id': 0})
+        if key in doc
+    }
+    
+    shadow_ready = False
+    operations = []
+    seen = set()
+    changes = 0
+    
+    def prepare_shadow():
+        shadow.drop()
+        if existing:
+            live.aggregate([{'$match': {}}, {'$out': shadow.name}])
+        # Index the shadow before writing to it, so upserts by key don't
+        # scan it (see app/models/indexes.py)
+        if name in INDEXES:
+            shadow.create_indexes(INDEXES[name])
+    
+    for record in records:
+        record.pop('_id', None)
+        record_key = record[key]
+        seen.add(record_key)
+        
+        record_hash = content_hash(record)
+        if existing.get(record_key) == record_hash:
+            continue
+        
+        if not shadow_ready:
+            prepare_shadow()
+            shadow_ready = True
+        
+        record[HASH_FIELD] = record_hash
+        operations.append(ReplaceOne({key: record_key}, record, upsert=True))
+        changes += 1
+        if len(operations) >= BATCH_SIZE:
+            shadow.bulk_write(operations, ordered=False)
+            operations = []
+    
+    removed = [record_key for record_key in existing if record_key not in seen]
+    if not shadow_ready and not removed:
+        print(f"{name}: {len(seen)} records unchanged, skipping")
+        return 0
+    
+    if not shadow_ready:
+        prepare_shadow()
+    if operations:
+        shadow.bulk_write(operations, ordered=False)
+    if removed:
+        shadow.delete_many({key: {'$in': removed}})
+        changes += len(removed)
+    
+    # Atomically replace the live collection
+    shadow.rename(name, dropTarget=True)
+    print(f"{name}: {changes} records upserted or deleted")
+    return changes
 
 def determine_generation(pokemon_id):
     """Determine the generation of a Pokémon based on its ID."""
@@ -149,11 +287,7 @@ def setup_generations():
         }
     ]
     
-    if generations_collection.count_documents({}) == 0:
-        generations_collection.insert_many(generations)
-        print(f"Inserted {len(generations)} generations")
-    else:
-        print("Generations collection already exists, skipping...")
+    return sync_collection('generations', generations)
 
 def import_pokemon_data():
     """Import Pokémon data from pokedex.json."""
@@ -161,32 +295,26 @@ def import_pokemon_data():
     
     if not os.path.exists(pokemon_file):
         print(f"Error: {pokemon_file} not found")
-        return
+        return 0
     
     try:
-        with open(pokemon_file, 'r', encoding='utf-8') as f:
-            pokemon_data = json.load(f)
-        
-        # Drop existing collection if it exists
-        pokemon_collection.drop()
-        
-        # Process each Pokémon entry
-        for pokemon in pokemon_data:
-            # Add generation field
-            generation = determine_generation(pokemon['id'])
-            pokemon['generation'] = generation
-            
-            # Add legendary/mythical flags
-            pokemon_name = pokemon['name']['english']
-            pokemon['is_legendary'] = is_legendary(pokemon['id'], pokemon_name)
-            pokemon['is_mythical'] = is_mythical(pokemon['id'], pokemon_name)
-        
-        # Insert all Pokémon data
-        pokemon_collection.insert_many(pokemon_data)
-        print(f"Inserted {len(pokemon_data)} Pokémon")
-        
+        return sync_collection('pokemon', map(prepare_pokemon, iter_json_array(pokemon_file)))
     except Exception as e:
         print(f"Error importing Pokémon data: {e}")
+        return 0
+
+def prepare_pokemon(pokemon):
+    """Add the fields the app derives from a Pokémon's data."""
+    # Add generation field
+    pokemon['generation'] = determine_generation(pokemon['id'])
+    
+    # Add legendary/mythical flags
+    pokemon_name = pokemon['name']['english']
+    pokemon['is_legendary'] = is_legendary(pokemon['id'], pokemon_name)
+    pokemon['is_mythical'] = is_mythical(pokemon['id'], pokemon_name)
+    
+    # Canonical names, stats and abilities
+    return normalize_pokemon(pokemon)
 
 def import_types_data():
     """Import type data from types.json."""
@@ -194,46 +322,40 @@ def import_types_data():
     
     if not os.path.exists(types_file):
         print(f"Error: {types_file} not found")
-        return
+        return 0
     
     try:
-        with open(types_file, 'r', encoding='utf-8') as f:
-            types_data = json.load(f)
-        
-        # Drop existing collection if it exists
-        types_collection.drop()
-        
-        # Add color field for UI
-        type_colors = {
-            "Normal": "#A8A77A",
-            "Fire": "#EE8130",
-            "Water": "#6390F0",
-            "Electric": "#F7D02C",
-            "Grass": "#7AC74C",
-            "Ice": "#96D9D6",
-            "Fighting": "#C22E28",
-            "Poison": "#A33EA1",
-            "Ground": "#E2BF65",
-            "Flying": "#A98FF3",
-            "Psychic": "#F95587",
-            "Bug": "#A6B91A",
-            "Rock": "#B6A136",
-            "Ghost": "#735797",
-            "Dragon": "#6F35FC",
-            "Dark": "#705746",
-            "Steel": "#B7B7CE",
-            "Fairy": "#D685AD"
-        }
-        
-        for type_entry in types_data:
-            type_entry['color'] = type_colors.get(type_entry['english'], "#777777")
-        
-        # Insert all type data
-        types_collection.insert_many(types_data)
-        print(f"Inserted {len(types_data)} types")
-        
+        return sync_collection('types', map(prepare_type, iter_json_array(types_file)), key='english')
     except Exception as e:
         print(f"Error importing type data: {e}")
+        return 0
+
+# Color of each type for the UI
+TYPE_COLORS = {
+    "Normal": "#A8A77A",
+    "Fire": "#EE8130",
+    "Water": "#6390F0",
+    "Electric": "#F7D02C",
+    "Grass": "#7AC74C",
+    "Ice": "#96D9D6",
+    "Fighting": "#C22E28",
+    "Poison": "#A33EA1",
+    "Ground": "#E2BF65",
+    "Flying": "#A98FF3",
+    "Psychic": "#F95587",
+    "Bug": "#A6B91A",
+    "Rock": "#B6A136",
+    "Ghost": "#735797",
+    "Dragon": "#6F35FC",
+    "Dark": "#705746",
+    "Steel": "#B7B7CE",
+    "Fairy": "#D685AD"
+}
+
+def prepare_type(type_entry):
+    """Add the UI color of a type."""
+    type_entry['color'] = TYPE_COLORS.get(type_entry['english'], "#777777")
+    return type_entry
 
 def import_moves_data():
     """Import move data from moves.json."""
@@ -241,21 +363,13 @@ def import_moves_data():
     
     if not os.path.exists(moves_file):
         print(f"Error: {moves_file} not found")
-        return
+        return 0
     
     try:
-        with open(moves_file, 'r', encoding='utf-8') as f:
-            moves_data = json.load(f)
-        
-        # Drop existing collection if it exists
-        moves_collection.drop()
-        
-        # Insert all move data
-        moves_collection.insert_many(moves_data)
-        print(f"Inserted {len(moves_data)} moves")
-        
+        return sync_collection('moves', map(normalize_move, iter_json_array(moves_file)))
     except Exception as e:
         print(f"Error importing move data: {e}")
+        return 0
 
 def import_items_data():
     """Import item data from items.json."""
@@ -263,36 +377,49 @@ def import_items_data():
     
     if not os.path.exists(items_file):
         print(f"Error: {items_file} not found")
-        return
+        return 0
     
     try:
-        with open(items_file, 'r', encoding='utf-8') as f:
-            items_data = json.load(f)
-        
-        # Drop existing collection if it exists
-        items_collection.drop()
-        
-        # Insert all item data
-        items_collection.insert_many(items_data)
-        print(f"Inserted {len(items_data)} items")
-        
+        return sync_collection('items', map(normalize_item, iter_json_array(items_file)))
     except Exception as e:
         print(f"Error importing item data: {e}")
+        return 0
 
-if __name__ == "__main__":
+def bump_dataset_version():
+    """Bump the dataset version so running apps reload their snapshot."""
+    meta = meta_collection.find_one_and_update(
+        {'_id': 'dataset'},
+        {
+            '$inc': {'version': 1},
+            '$set': {'updated_at': datetime.now(timezone.utc)}
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    print(f"Dataset version is now {meta['version']}")
+
+def main():
     print("Starting data import...")
     
-    # Create indexes for collections
-    pokemon_collection.create_index('id', unique=True)
-    pokemon_collection.create_index('name.english')
-    pokemon_collection.create_index('type')
-    pokemon_collection.create_index('generation')
+    # Import data; each collection is indexed before it is swapped in
+    changes = 0
+    changes += setup_generations()
+    changes += import_pokemon_data()
+    changes += import_types_data()
+    changes += import_moves_data()
+    changes += import_items_data()
+    
+    # Make sure every manifest index exists, also on collections that
+    # weren't swapped and on collections the app writes (teams)
+    ensure_indexes(db)
     
-    # Import data
-    setup_generations()
-    import_pokemon_data()
-    import_types_data()
-    import_moves_data()
-    import_items_data()
+    # Only make running apps reload when something changed
+    if changes:
+        bump_dataset_version()
+    else:
+        print("No changes, dataset version unchanged")
     
-    print("Data import completed!") 
\ No newline at end of file
+    print("Data import completed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to sys.path
+parent_dir = str(Path(__file__).resolve().parent.parent.parent)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from pokedex_app.app import create_app
+from pokedex_app.app.services.warmup import warm_up, format_report
+
+
+def main():
+    """Warm the caches after a deploy or an import; same as `flask cache warm`."""
+    parser = argparse.ArgumentParser(description='Request every dataset page once to fill the caches.')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent requests (default: 8)')
+    args = parser.parse_args()
+
+    app = create_app()
+    print("Warming caches...")
+    report = warm_up(app, workers=args.workers)
+    for line in format_report(report):
+        print(line)
+    sys.exit(1 if report['errors'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Shared fixtures: the real dataset, an in-memory snapshot and a test app."""
+import copy
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add the repository root to sys.path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from pokedex_app.config import TestingConfig
+from pokedex_app.app.models.snapshot import SnapshotData
+from pokedex_app.app.utils.normalize import normalize_move, normalize_item
+from pokedex_app.app.utils.cache import tiered_cache
+
+DATA_DIR = os.path.join(ROOT_DIR, 'pokemon-data.json')
+DATASET_UPDATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _load(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='session')
+def records():
+    """Records of every collection, prepared the way scripts/import_data.py stores them."""
+    from pokedex_app.scripts.import_data import prepare_pokemon, prepare_type
+    return {
+        'pokemon': [prepare_pokemon(p) for p in _load('pokedex.json')],
+        'moves': [normalize_move(m) for m in _load('moves.json')],
+        'types': [prepare_type(t) for t in _load('types.json')],
+        'items': [normalize_item(i) for i in _load('items.json')]
+    }
+
+
+@pytest.fixture(scope='session')
+def snapshot_data(records):
+    """A SnapshotData built straight from the records, without MongoDB."""
+    data = copy.deepcopy(records)
+    return SnapshotData(1, data['pokemon'], data['moves'], data['types'], data['items'],
+                        updated_at=DATASET_UPDATED_AT)
+
+
+@pytest.fixture(scope='session')
+def mongo_client(records):
+    """An in-memory MongoDB (mongomock) holding the dataset."""
+    mongomock = pytest.importorskip('mongomock')
+    client = mongomock.MongoClient()
+    db = client[TestingConfig.MONGO_DB_NAME]
+    for name in ('pokemon', 'moves', 'types', 'items'):
+        db[name].insert_many(copy.deepcopy(records[name]))
+    db['meta'].insert_one({'_id': 'dataset', 'version': 1, 'updated_at': DATASET_UPDATED_AT})
+    return client
+
+
+@pytest.fixture(scope='session')
+def app(mongo_client):
+    """An app created by create_app(TestingConfig) on the in-memory database."""
+    from pokedex_app.app import create_app
+    import pokedex_app.app.models.mongodb as mongodb
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(mongodb, 'MongoClient', lambda uri, event_listeners=None: mongo_client)
+        yield create_app(TestingConfig)
+
+
+@pytest.fixture
+def client(app):
+    """A test client; caches are emptied so every test starts cold."""
+    tiered_cache.clear()
+    return app.test_client()
@@ -0,0 +1,58 @@
+import pytest
+
+
+def test_batch_post_keeps_the_requested_order(client):
+    response = client.post('/api/pokemon/batch', json={'ids': [25, 1, 99999, 4], 'fields': 'id'})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [pokemon['id'] for pokemon in data['pokemon']] == [25, 1, 4]
+    assert data['missing'] == [99999]
+
+
+def test_batch_get_reads_comma_separated_ids(client):
+    response = client.get('/api/pokemon/batch?ids=1, 2&ids=3&fields=id')
+
+    assert response.status_code == 200
+    assert [pokemon['id'] for pokemon in response.get_json()['pokemon']] == [1, 2, 3]
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2, 3],
+    'ids',
+    {'ids': '123'},
+    {'ids': 25},
+    {'ids': ['1', '2']},
+    {'ids': [1.5]},
+    {'ids': [True]},
+    {'ids': [None]},
+    {'ids': [1], 'fields': ['id']},
+    {'ids': []},
+    {}
+])
+def test_batch_post_rejects_malformed_bodies(client, body):
+    response = client.post('/api/pokemon/batch', json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error']
+
+
+def test_batch_post_rejects_a_non_json_body(client):
+    response = client.post('/api/pokemon/batch', data='ids=1,2', content_type='text/plain')
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('query', ['ids=1,x', 'ids=', ''])
+def test_batch_get_rejects_bad_ids(client, query):
+    assert client.get(f'/api/pokemon/batch?{query}').status_code == 400
+
+
+def test_batch_limits_the_number_of_ids(client, app):
+    max_ids = app.config['API_BATCH_MAX_IDS']
+
+    assert client.post('/api/pokemon/batch', json={'ids': list(range(1, max_ids + 2))}).status_code == 400
+
+
+def test_team_analysis_rejects_an_array_body(client):
+    assert client.post('/api/teams/analyze', json=[{'pokemon': []}]).status_code == 400
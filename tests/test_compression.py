@@ -0,0 +1,69 @@
+import gzip
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from pokedex_app.app.utils.cache import tiered_cache
+from pokedex_app.app.utils.compression import compression
+from pokedex_app.app.utils.page_cache import page_key
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('identity', None),
+    ('', None)
+])
+def test_negotiation_follows_accept_encoding(app, accept, expected):
+    with app.test_request_context(headers={'Accept-Encoding': accept}):
+        assert compression.negotiate('text/html', 10000) == expected
+
+
+def test_wildcard_gets_the_servers_preferred_encoding(app):
+    with app.test_request_context(headers={'Accept-Encoding': '*'}):
+        assert compression.negotiate('application/json', 10000) == compression.encodings[0]
+
+
+def test_small_and_binary_bodies_are_not_compressed(app):
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        assert compression.negotiate('text/html', compression.min_size - 1) is None
+        assert compression.negotiate('image/png', 10000) is None
+
+
+def test_gzip_response(client):
+    response = client.get('/api/pokemon?limit=50', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/api/pokemon?limit=50')
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == plain.data
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+
+def test_compressed_responses_get_a_weak_etag_that_still_revalidates(client):
+    response = client.get('/api/pokemon?limit=50', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+
+    assert etag.startswith('W/')
+    revalidated = client.get('/api/pokemon?limit=50', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+
+
+def test_refused_encoding_is_not_used(client):
+    response = client.get('/api/pokemon?limit=50', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_cached_pages_keep_their_compressed_copy(app, client):
+    first = client.get('/pokemon/25', headers={'Accept-Encoding': 'gzip'})
+
+    with app.test_request_context():
+        page = tiered_cache.get(page_key('pokemon.pokemon_detail', {'pokedex_id': 25}, MultiDict()))
+    assert page['encoded']['gzip'] == first.data
+    assert gzip.decompress(first.data) == page['body']
+
+    again = client.get('/pokemon/25', headers={'Accept-Encoding': 'gzip'})
+    assert again.data == first.data
+    assert again.headers['Content-Encoding'] == 'gzip'
@@ -0,0 +1,54 @@
+from pokedex_app.app.utils.evolution import build_evolution_families
+
+EEVEE = 133
+EEVEELUTIONS = {134, 135, 136, 196, 197, 470, 471, 700}
+
+
+def test_branching_family_is_nested_under_its_parent(snapshot_data):
+    tree = snapshot_data.evolution_families[EEVEE]['tree']
+
+    assert tree['pokemon']['id'] == EEVEE
+    children = {child['pokemon']['id'] for child in tree['children']}
+    assert children == EEVEELUTIONS & set(snapshot_data.pokemon_by_id)
+    assert all(not child['children'] for child in tree['children'])
+
+
+def test_linear_family_tree_follows_stages(snapshot_data):
+    tree = snapshot_data.evolution_families[4]['tree']
+
+    assert [tree['pokemon']['id'], tree['children'][0]['pokemon']['id'],
+            tree['children'][0]['children'][0]['pokemon']['id']] == [4, 5, 6]
+    assert tree['children'][0]['pokemon']['evolves_from'] == 4
+
+
+def test_every_member_is_in_the_tree_once(snapshot_data):
+    def walk(node):
+        yield node['pokemon']['id']
+        for child in node['children']:
+            yield from walk(child)
+
+    for family in {id(f): f for f in snapshot_data.evolution_families.values()}.values():
+        assert sorted(walk(family['tree'])) == sorted(family['members'])
+
+
+def test_prev_link_alone_builds_a_family():
+    def pokemon(pokemon_id, evolution):
+        return {'id': pokemon_id, 'name': {'english': str(pokemon_id)},
+                'image': {'sprite': '', 'thumbnail': '', 'hires': ''}, 'evolution': evolution}
+
+    families = build_evolution_families({
+        1: pokemon(1, {}),
+        2: pokemon(2, {'prev': ['1', 'Level 16']})
+    })
+
+    assert families[1] is families[2]
+    assert families[2]['tree']['children'][0]['pokemon']['evolution_level'] == 16
+
+
+def test_detail_page_draws_branches_from_the_parent(client):
+    html = client.get(f'/pokemon/{EEVEE}').get_data(as_text=True)
+
+    assert html.count('class="evolution-branch"') == len(EEVEELUTIONS)
+    # Vaporeon has no evolution of its own, so nothing hangs under it
+    vaporeon = html.index('/pokemon/134"')
+    assert 'evolution-branches' not in html[vaporeon:html.index('/pokemon/135"')]
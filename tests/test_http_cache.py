@@ -0,0 +1,94 @@
+import time
+
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_date
+
+from pokedex_app.app.utils.cache import tiered_cache
+from pokedex_app.app.utils.code_version import VERSION_LENGTH, code_version
+from pokedex_app.app.utils.http_cache import dataset_etag
+
+
+def test_etag_and_revalidation(client):
+    response = client.get('/api/pokemon/25')
+    etag = response.headers['ETag']
+
+    assert response.status_code == 200
+    assert response.cache_control.public
+    assert response.cache_control.max_age == 3600
+    assert response.last_modified is not None
+
+    revalidated = client.get('/api/pokemon/25', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+
+
+def test_changed_etag_gets_the_full_response(client):
+    response = client.get('/api/pokemon/25', headers={'If-None-Match': '"stale"'})
+
+    assert response.status_code == 200
+    assert response.get_json()['id'] == 25
+
+
+def test_if_modified_since(client):
+    last_modified = client.get('/api/types').headers['Last-Modified']
+
+    assert client.get('/api/types', headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get('/api/types', headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'}).status_code == 200
+
+
+def test_last_modified_moves_with_the_deploy(app, client, monkeypatch):
+    last_modified = client.get('/api/types').headers['Last-Modified']
+
+    # A deploy after the last import makes earlier copies stale
+    monkeypatch.setitem(app.config, 'HTTP_CACHE_DEPLOYED_AT', time.time() + 3600)
+    response = client.get('/api/types', headers={'If-Modified-Since': last_modified})
+
+    assert response.status_code == 200
+    assert response.last_modified > parse_date(last_modified)
+
+
+def test_etags_differ_per_url(client):
+    etags = {client.get(url).headers['ETag'] for url in ('/api/pokemon/25', '/api/pokemon/26', '/api/pokemon?page=2')}
+
+    assert len(etags) == 3
+
+
+def test_errors_are_not_cacheable(client):
+    response = client.get('/api/pokemon/99999')
+
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+
+def test_salt_defaults_to_the_code_version(app):
+    salt = app.config['HTTP_CACHE_SALT']
+
+    assert salt == code_version(app.root_path)
+    assert len(salt) == VERSION_LENGTH
+
+
+def test_code_version_changes_with_the_templates(tmp_path):
+    (tmp_path / 'templates').mkdir()
+    page = tmp_path / 'templates' / 'page.html'
+    page.write_text('<p>{{ pokemon.name }}</p>')
+    before = code_version(str(tmp_path))
+
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'module.pyc').write_bytes(b'\x00')
+    assert code_version(str(tmp_path)) == before
+
+    page.write_text('<h1>{{ pokemon.name }}</h1>')
+    assert code_version(str(tmp_path)) != before
+
+
+def test_salt_is_part_of_etags_and_cache_keys(app, monkeypatch):
+    with app.test_request_context('/api/pokemon/25'):
+        etag = dataset_etag('api.get_pokemon', {'pokemon_id': 25}, MultiDict())
+        key = tiered_cache.versioned_key('page:x')
+
+        monkeypatch.setitem(app.config, 'HTTP_CACHE_SALT', 'next-release')
+        monkeypatch.setattr(tiered_cache, 'salt', 'next-release')
+
+        assert dataset_etag('api.get_pokemon', {'pokemon_id': 25}, MultiDict()) != etag
+        assert tiered_cache.versioned_key('page:x') != key
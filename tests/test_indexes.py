@@ -0,0 +1,51 @@
+import os
+
+from pokedex_app.app.models.indexes import INDEXES, QUERY_SHAPES, ensure_indexes
+from tests.conftest import ROOT_DIR
+
+
+def _index_keys(collection):
+    return [list(model.document['key']) for model in INDEXES.get(collection, [])]
+
+
+def test_every_query_shape_has_an_index():
+    for collection, query, sort in QUERY_SHAPES:
+        fields = list(query) + [field for field, _ in sort or []]
+        if fields[0] == '_id':
+            continue  # Every collection has an _id index
+        assert any(keys[:len(fields)] == fields for keys in _index_keys(collection)), (collection, query, sort)
+
+
+def test_importer_keys_are_unique_indexes():
+    for collection, key in (('pokemon', 'id'), ('moves', 'id'), ('items', 'id'),
+                            ('types', 'english'), ('generations', 'id')):
+        (model,) = [m for m in INDEXES[collection] if list(m.document['key']) == [key]]
+        assert model.document.get('unique')
+
+
+def test_ensure_indexes_creates_the_manifest(mongo_client):
+    db = mongo_client['indexes_test_db']
+    ensure_indexes(db, ['teams'])
+
+    keys = [list(index['key']) for index in db['teams'].list_indexes()]
+    assert ['owner', 'created_at', '_id'] in keys
+
+
+def test_startup_check_is_off_by_default(app):
+    # The app fixture uses mongomock, which can't explain queries
+    assert app.config['INDEX_CHECK_ON_STARTUP'] is False
+
+
+def test_only_the_snapshot_and_team_store_query_mongo():
+    # QUERY_SHAPES only lists their queries; anything else reading a
+    # collection at request time would go unchecked
+    app_dir = os.path.join(ROOT_DIR, 'pokedex_app', 'app')
+    querying = set()
+    for root, _, files in os.walk(app_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith('.py'):
+                with open(path, encoding='utf-8') as f:
+                    if 'get_collection(' in f.read():
+                        querying.add(os.path.relpath(path, app_dir).replace(os.sep, '/'))
+    assert querying == {'models/mongodb.py', 'models/snapshot.py', 'models/team_store.py'}
@@ -0,0 +1,32 @@
+import threading
+
+from pokedex_app.app.models import snapshot as snapshot_module
+from pokedex_app.app.models.snapshot import SnapshotData
+
+
+def test_learnset_is_built_once_under_concurrency(records, monkeypatch):
+    data = SnapshotData(1, records['pokemon'], records['moves'], records['types'], records['items'])
+    builds = []
+    build_learnset = snapshot_module.build_learnset
+
+    def counting_build(*args):
+        builds.append(args[0]['id'])
+        return build_learnset(*args)
+
+    monkeypatch.setattr(snapshot_module, 'build_learnset', counting_build)
+    start = threading.Barrier(8)
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(data.learnset(25))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == [25]
+    assert all(result is results[0] for result in results)
+    assert data.learnset(99999) is None
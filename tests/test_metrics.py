@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip('prometheus_client')
+
+from pokedex_app.app.utils.metrics import metrics
+
+
+def _in_flight():
+    return metrics.in_flight._value.get()
+
+
+def test_request_context_without_dispatch_leaves_the_gauge_alone(app):
+    before = _in_flight()
+
+    for _ in range(3):
+        with app.test_request_context('/pokemon/25'):
+            pass
+
+    assert _in_flight() == before
+
+
+def test_requests_are_counted_in_and_out(client):
+    before = _in_flight()
+
+    assert client.get('/api/types').status_code == 200
+    assert client.get('/no-such-page').status_code == 404
+
+    assert _in_flight() == before
+
+
+def test_failing_before_request_handler_leaves_the_gauge_alone(app):
+    before = _in_flight()
+
+    def fail():
+        raise RuntimeError('before_request failed')
+
+    # Runs before metrics' own handler, which then never starts the request
+    app.before_request_funcs.setdefault(None, []).insert(0, fail)
+    try:
+        with pytest.raises(RuntimeError):
+            app.test_client().get('/api/types')
+    finally:
+        app.before_request_funcs[None].remove(fail)
+
+    assert _in_flight() == before
+
+
+def test_metrics_endpoint(client):
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert b'pokedex_requests_in_flight' in response.data
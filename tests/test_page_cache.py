@@ -0,0 +1,78 @@
+from werkzeug.datastructures import MultiDict
+
+from pokedex_app.app.services.sitemap import site_urls
+from pokedex_app.app.services.warmup import cached_urls, warm_up
+from pokedex_app.app.utils.cache import tiered_cache
+from pokedex_app.app.utils.page_cache import page_key
+
+LIST_PARAMS = ('page', 'generation', 'type', 'q')
+LIST_DEFAULTS = {'page': '1'}
+
+
+def _list_key(query):
+    return page_key('pokemon.pokemon_list', {}, MultiDict(query), LIST_PARAMS, LIST_DEFAULTS)
+
+
+def test_page_key_ignores_unread_blank_and_default_parameters():
+    key = _list_key([])
+
+    assert _list_key([('page', '1')]) == key
+    assert _list_key([('utm_source', 'mail'), ('q', ' ')]) == key
+    assert _list_key([('page', '2')]) != key
+
+
+def test_page_key_ignores_parameter_order():
+    assert _list_key([('type', 'Fire'), ('generation', '1')]) == _list_key([('generation', '1'), ('type', 'Fire')])
+    assert _list_key([('type', 'Fire')]) != _list_key([('type', 'Water')])
+
+
+def test_page_key_covers_the_endpoint_and_url_parameters():
+    args = MultiDict()
+    detail = page_key('pokemon.pokemon_detail', {'pokedex_id': 25}, args)
+
+    assert detail.startswith('page:pokemon.pokemon_detail:')
+    assert detail != page_key('pokemon.pokemon_detail', {'pokedex_id': 26}, args)
+    assert detail != page_key('api.get_pokemon', {'pokedex_id': 25}, args)
+
+
+def test_pages_are_served_from_the_cache(app, client):
+    first = client.get('/pokemon/?page=2&utm_source=mail')
+
+    with app.test_request_context():
+        cached = tiered_cache.get(_list_key([('page', '2')]))
+    assert cached['body'] == first.data
+    assert client.get('/pokemon/?page=2').data == first.data
+
+
+def test_errors_are_not_cached(app, client):
+    assert client.get('/pokemon/99999').status_code == 404
+
+    with app.test_request_context():
+        assert tiered_cache.get(page_key('pokemon.pokemon_detail', {'pokedex_id': 99999}, MultiDict())) is None
+
+
+def test_evolution_fragment_is_shared_by_the_family(app, client):
+    pages = {pokemon_id: client.get(f'/pokemon/{pokemon_id}').get_data(as_text=True) for pokemon_id in (133, 134, 135)}
+
+    with app.test_request_context():
+        assert tiered_cache.get('fragment:partials/evolution_chain.html:133') is not None
+        assert tiered_cache.get('fragment:partials/evolution_chain.html:134') is None
+
+    # Each page highlights its own Pokémon in the shared fragment
+    for pokemon_id, html in pages.items():
+        assert f'.evolution-stage[data-pokemon-id="{pokemon_id}"]' in html
+        assert 'class="evolution-stage current"' not in html
+        assert html.count('data-pokemon-id="136"') == 1
+
+
+def test_warm_up_requests_only_cached_pages(app, client):
+    with app.test_request_context():
+        urls = cached_urls(app, site_urls())
+    endpoints = {endpoint for endpoint, _ in urls}
+
+    assert 'pokemon.pokemon_detail' in endpoints
+    assert not any(endpoint.startswith('api.') for endpoint in endpoints)
+
+    report = warm_up(app, workers=2, urls=urls[:5])
+    assert report['requests'] == 5 and not report['errors']
+    assert tiered_cache.get(page_key('main.index', {}, MultiDict())) is not None
@@ -0,0 +1,116 @@
+import re
+from html import unescape
+
+import pytest
+
+from pokedex_app.app.utils.pagination import decode_cursor, encode_cursor, keyset_page, paginate
+from pokedex_app.app.routes.pokemon import ITEMS_PER_PAGE
+
+RECORDS = [{'id': record_id} for record_id in (1, 2, 5, 8, 13, 21, 34)]
+
+
+@pytest.mark.parametrize('last_id', [0, 1, 25, 10008, -3])
+def test_cursor_round_trip(last_id):
+    cursor = encode_cursor(last_id)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == last_id
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-base64!', encode_cursor('abc'), 'dGVhbTox', 'é'])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_page_starts_after_the_cursor_id():
+    page, next_cursor = keyset_page(RECORDS, 5, 2)
+    assert [record['id'] for record in page] == [8, 13]
+    assert decode_cursor(next_cursor) == 13
+
+    # IDs that aren't in the list still find their place
+    page, _ = keyset_page(RECORDS, 6, 2)
+    assert [record['id'] for record in page] == [8, 13]
+
+    page, next_cursor = keyset_page(RECORDS, 13, 5)
+    assert [record['id'] for record in page] == [21, 34]
+    assert next_cursor is None
+
+
+def test_cursor_and_page_numbers_walk_the_same_records():
+    by_page = [paginate(RECORDS, 3, page=page)[0] for page in (1, 2, 3)]
+
+    by_cursor, after = [], None
+    while True:
+        page, pagination = paginate(RECORDS, 3, after=after)
+        by_cursor.append(page)
+        after = pagination['next_cursor']
+        if after is None:
+            break
+
+    assert by_cursor == by_page
+    assert pagination['page'] is None
+
+
+def _item_names(html):
+    return re.findall(r'<h5 class="item-name">(.*?)</h5>', html)
+
+
+def _next_link(html):
+    match = re.search(r'href="([^"]*)" aria-label="Next"', html)
+    return unescape(match.group(1)) if match else None
+
+
+@pytest.mark.parametrize('page', ['0', '-1', '-5', 'x'])
+def test_items_page_is_clamped_to_the_first(client, page):
+    first = client.get('/pokemon/items').get_data(as_text=True)
+    response = client.get(f'/pokemon/items?page={page}')
+
+    assert response.status_code == 200
+    assert _item_names(response.get_data(as_text=True)) == _item_names(first)
+    assert len(_item_names(first)) == ITEMS_PER_PAGE
+
+
+def test_items_next_link_follows_the_cursor(client):
+    first = client.get('/pokemon/items').get_data(as_text=True)
+    second = client.get('/pokemon/items?page=2').get_data(as_text=True)
+
+    next_url = _next_link(first)
+    assert 'after=' in next_url
+    followed = client.get(next_url).get_data(as_text=True)
+    assert _item_names(followed) == _item_names(second)
+
+    # Cursor pages keep linking forward
+    assert _next_link(followed) != next_url
+    assert _item_names(client.get(_next_link(followed)).get_data(as_text=True)) == \
+        _item_names(client.get('/pokemon/items?page=3').get_data(as_text=True))
+
+
+def test_items_rejects_a_malformed_cursor(client):
+    assert client.get('/pokemon/items?after=bogus').status_code == 400
+
+
+@pytest.mark.parametrize('endpoint, key, default', [('/api/pokemon', 'pokemon', 20), ('/api/moves', 'moves', 50)])
+@pytest.mark.parametrize('query, expected_limit', [
+    ('limit=0', 1),
+    ('limit=-5', 1),
+    ('limit=abc', None),
+    ('limit=100000', 100),
+    ('limit=', None)
+])
+def test_api_page_size_is_clamped(client, endpoint, key, default, query, expected_limit):
+    response = client.get(f'{endpoint}?{query}')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['pagination']['per_page'] == (expected_limit or default)
+    assert len(data[key]) == (expected_limit or default)
+
+
+@pytest.mark.parametrize('page', ['0', '-3', 'x'])
+def test_api_page_number_is_clamped(client, page):
+    first = client.get('/api/moves?limit=5').get_json()
+    response = client.get(f'/api/moves?limit=5&page={page}').get_json()
+
+    assert response['moves'] == first['moves']
+    assert response['pagination']['page'] == 1
@@ -0,0 +1,39 @@
+import pytest
+
+from pokedex_app.app.services import pokemon_service
+
+
+@pytest.fixture(autouse=True)
+def no_mongo(app, monkeypatch):
+    """Fail any test that reaches MongoDB; the service reads the snapshot."""
+    from pokedex_app.app.models import mongodb
+
+    def get_collection(name):
+        raise AssertionError(f'queried the {name} collection')
+
+    monkeypatch.setattr(mongodb.mongo, 'get_collection', get_collection)
+    with app.app_context():
+        yield
+
+
+def test_lookups_by_id_and_name():
+    assert pokemon_service.get_pokemon_by_id(25)['name']['english'] == 'Pikachu'
+    assert pokemon_service.get_pokemon_by_id(99999) is None
+    assert pokemon_service.get_pokemon_by_name(' pikachu ')['id'] == 25
+
+
+def test_lists_are_paged_in_id_order():
+    first_gen = pokemon_service.get_pokemon_by_generation(1)
+    page = pokemon_service.get_pokemon_by_generation(1, limit=5, skip=10)
+
+    assert [p['id'] for p in page] == [p['id'] for p in first_gen[10:15]]
+    assert all(p['generation'] == 1 for p in first_gen)
+    assert all('Fire' in p['type'] for p in pokemon_service.get_pokemon_by_type('Fire', limit=3))
+    assert [p['id'] for p in pokemon_service.get_all_pokemon(limit=3)] == [1, 2, 3]
+    assert len(pokemon_service.get_all_pokemon(skip=1)) == pokemon_service.get_pokemon_count() - 1
+
+
+def test_evolutions():
+    stages = pokemon_service.get_pokemon_evolutions(133)
+
+    assert {stage['id'] for stage in stages} >= {133, 134, 135, 136}
@@ -0,0 +1,53 @@
+import pytest
+
+from pokedex_app.app.utils.projection import INTERNAL_FIELDS, parse_fields, project
+
+PIKACHU = 25
+
+
+def test_parse_fields_expands_presets_and_paths():
+    assert parse_fields('id,name.english') == {'id': True, 'name': {'english': True}}
+    assert parse_fields('card') == {'id': True, 'name': {'english': True}, 'type': True,
+                                    'image': {'sprite': True}}
+    assert parse_fields('name,name.english') == {'name': True}
+    assert parse_fields('') is None
+
+
+def test_internal_fields_cannot_be_selected():
+    assert parse_fields('name_lower,stats,abilities') is None
+    assert parse_fields('id,stats') == {'id': True}
+
+
+def test_project_drops_internal_fields(snapshot_data):
+    pokemon = snapshot_data.pokemon_by_id[PIKACHU]
+
+    assert INTERNAL_FIELDS <= set(pokemon)
+    assert not INTERNAL_FIELDS & set(project(pokemon, None))
+    assert project(pokemon, parse_fields('id,name.english')) == {'id': PIKACHU, 'name': {'english': 'Pikachu'}}
+
+
+@pytest.mark.parametrize('url', [
+    '/api/pokemon',
+    '/api/pokemon?fields=summary',
+    '/api/pokemon?fields=detail',
+    '/api/pokemon?fields=id,stats,name_lower'
+])
+def test_api_lists_only_public_fields(client, url):
+    for pokemon in client.get(url).get_json()['pokemon']:
+        assert not INTERNAL_FIELDS & set(pokemon)
+
+
+def test_api_detail_and_batch_return_the_dataset_shape(client):
+    detail = client.get(f'/api/pokemon/{PIKACHU}').get_json()
+    batch = client.post('/api/pokemon/batch', json={'ids': [PIKACHU]}).get_json()['pokemon'][0]
+
+    for pokemon in (detail, batch):
+        assert not INTERNAL_FIELDS & set(pokemon)
+        assert pokemon['base']['Speed'] == 90
+    assert 'type_effectiveness' in detail
+
+
+def test_presets_select_base_stats(client):
+    for preset in ('summary', 'detail'):
+        pokemon = client.get(f'/api/pokemon/{PIKACHU}?fields={preset}').get_json()
+        assert pokemon['base']['HP'] == 35
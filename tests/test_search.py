@@ -0,0 +1,92 @@
+import pytest
+
+from pokedex_app.app.utils.search_index import NameSearchIndex, normalize
+
+POKEMON = [
+    {'id': 25, 'name': {'english': 'Pikachu', 'french': 'Pikachu'}},
+    {'id': 26, 'name': {'english': 'Raichu', 'french': 'Raichu'}},
+    {'id': 133, 'name': {'english': 'Eevee', 'french': 'Évoli'}},
+    {'id': 172, 'name': {'english': 'Pichu', 'french': 'Pichu'}},
+    {'id': 10, 'name': {'english': 'Caterpie', 'french': 'Chenipan'}}
+]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return NameSearchIndex(POKEMON)
+
+
+def test_normalize_folds_case_and_accents():
+    assert normalize('Évoli') == 'evoli'
+    assert normalize('PIKACHU') == 'pikachu'
+
+
+def test_results_are_ranked_exact_prefix_substring(index):
+    # 'pichu' is exact for Pichu; Pikachu and Raichu only contain 'chu'
+    assert index.search('pichu') == [172]
+    # Prefix matches come before Caterpie, which only contains 'pi'
+    assert index.search('pi') == [25, 172, 10]
+    assert index.search('chu') == [25, 26, 172]
+
+
+def test_search_matches_other_languages_and_ids(index):
+    assert index.search('evoli') == [133]
+    assert index.search('ÉVO') == [133]
+    assert index.search('133') == [133]
+
+
+def test_search_respects_the_limit_and_blank_queries(index):
+    assert index.search('i', limit=2) == [10, 25]
+    assert index.search('   ') == []
+    assert index.search('zzz') == []
+
+
+def test_name_search_route(client):
+    results = client.get('/search/?q=pika').get_json()
+
+    assert results[0]['id'] == 25
+    assert client.get('/search/?q=p').get_json() == []
+
+
+def test_levenshtein_is_bounded():
+    from pokedex_app.app.utils.fuzzy import levenshtein
+
+    assert levenshtein('pikachu', 'pikachu', 2) == 0
+    assert levenshtein('pikachu', 'pikachuu', 2) == 1
+    assert levenshtein('pikachu', 'pickachoo', 2) == 3
+    assert levenshtein('abc', 'abcdefgh', 2) == 3
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('pikachuu', ('pokemon', 25)),
+    ('charmandr', ('pokemon', 4)),
+    ('bulbasuar', ('pokemon', 1)),
+    ('thunderbolt', ('move', 85)),
+    ('Evoli', ('pokemon', 133))
+])
+def test_fuzzy_search_finds_misspelled_names(snapshot_data, query, expected):
+    distance, kind, record_id = snapshot_data.fuzzy_index().search(query)[0]
+
+    assert (kind, record_id) == expected
+    assert distance <= 2
+
+
+def test_fuzzy_results_rank_by_distance_then_kind(snapshot_data):
+    results = snapshot_data.fuzzy_index().search('pichu', limit=20)
+
+    assert results[0] == (0, 'pokemon', 172)
+    assert results == sorted(results, key=lambda r: (r[0], {'pokemon': 0, 'move': 1, 'item': 2}[r[1]], r[2]))
+    # Short queries only allow one edit
+    assert all(distance <= 1 for distance, _, _ in snapshot_data.fuzzy_index().search('abra'))
+
+
+def test_fuzzy_index_is_built_when_the_snapshot_loads(app):
+    from pokedex_app.app.models.snapshot import snapshot
+
+    assert snapshot.data._fuzzy_index is not None
+
+
+def test_fuzzy_search_route(client):
+    results = client.get('/search/?q=pikachuu&fuzzy=1').get_json()
+
+    assert results[0]['id'] == 25
@@ -0,0 +1,128 @@
+import json
+import multiprocessing
+
+import pytest
+
+from pokedex_app.app.models.snapshot import snapshot
+from pokedex_app.app.services import static_export
+from pokedex_app.app.services.sitemap import site_urls
+from pokedex_app.app.services.static_export import (
+    MANIFEST_NAME, DatasetChangedError, export_filename, export_site
+)
+
+URLS = [
+    ('main.index', '/'),
+    ('pokemon.pokemon_detail', '/pokemon/25'),
+    ('pokemon.pokemon_detail', '/pokemon/133'),
+    ('api.get_pokemon', '/api/pokemon/25'),
+    ('api.get_types', '/api/types')
+]
+
+# Worker processes inherit the in-memory database only when forked
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason='worker processes need the fork start method')
+
+
+@pytest.fixture
+def few_urls(monkeypatch):
+    monkeypatch.setattr(static_export, 'site_urls', lambda filters=False: list(URLS))
+
+
+@pytest.fixture
+def dataset_version(mongo_client, app):
+    """Set the version of the dataset in the database, restoring it afterwards."""
+    meta = mongo_client[app.config['MONGO_DB_NAME']]['meta']
+
+    def set_version(version):
+        meta.update_one({'_id': 'dataset'}, {'$set': {'version': version}})
+
+    yield set_version
+    set_version(1)
+    snapshot.reload()
+
+
+@pytest.fixture
+def import_during_export(monkeypatch, dataset_version):
+    """Bump the dataset version as soon as the first pages are rendered."""
+    export_urls = static_export._export_urls
+
+    def export_then_import(*args):
+        results = export_urls(*args)
+        dataset_version(2)
+        return results
+
+    monkeypatch.setattr(static_export, '_export_urls', export_then_import)
+
+
+def test_export_filename():
+    assert export_filename('/pokemon/25', 'text/html') == 'pokemon/25.html'
+    assert export_filename('/pokemon/', 'text/html') == 'pokemon/index.html'
+    assert export_filename('/api/types', 'application/json') == 'api/types.json'
+    assert export_filename('/pokemon/?type=Fire&page=2', 'text/html') == 'pokemon/index@page=2&type=Fire.html'
+    assert export_filename('/api/pokemon?page=2', 'application/json') == 'api/pokemon@page=2.json'
+
+
+def test_site_urls_cover_every_page_of_the_api_lists(app, client):
+    with app.test_request_context():
+        urls = site_urls()
+    pokemon_pages = [url for endpoint, url in urls if endpoint == 'api.get_pokemon_list']
+    moves_pages = [url for endpoint, url in urls if endpoint == 'api.get_moves']
+
+    assert pokemon_pages and moves_pages
+    exported = sum(len(client.get(url).get_json()['pokemon']) for url in pokemon_pages)
+    assert exported == len(snapshot.all_pokemon())
+
+
+def test_export_writes_pages_and_skips_unchanged_ones(app, few_urls, tmp_path):
+    report = export_site(app, str(tmp_path))
+
+    assert report['rendered'] == len(URLS) and not report['errors']
+    assert (tmp_path / 'pokemon' / '25.html').exists()
+    assert (tmp_path / 'api' / 'types.json.gz').exists()
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest['dataset_version'] == 1
+
+    again = export_site(app, str(tmp_path))
+    assert again['rendered'] == 0 and again['unchanged'] == len(URLS)
+
+
+@needs_fork
+def test_worker_processes_export_with_the_parents_app(app, few_urls, tmp_path):
+    report = export_site(app, str(tmp_path), processes=2)
+
+    assert report['rendered'] == len(URLS) and not report['errors']
+    assert (tmp_path / 'pokemon' / '133.html').exists()
+
+
+def test_export_exports_the_current_dataset(app, few_urls, tmp_path, dataset_version):
+    # Imported after the snapshot was last loaded
+    dataset_version(2)
+
+    export_site(app, str(tmp_path))
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest['dataset_version'] == 2
+
+
+@pytest.mark.parametrize('processes', [
+    1, pytest.param(2, marks=needs_fork)
+])
+def test_export_leaves_no_files_when_the_dataset_changed(app, few_urls, tmp_path, import_during_export, processes):
+    with pytest.raises(DatasetChangedError):
+        export_site(app, str(tmp_path), processes=processes)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_workers_are_created_with_the_parents_config(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'EXPORT_TEST_SETTING', 'from-parent')
+    monkeypatch.setattr(static_export, '_worker_app', None)
+    monkeypatch.setattr(static_export, '_worker_version', None)
+
+    static_export._init_worker(dict(app.config), 1)
+
+    worker_app = static_export._worker_app
+    assert worker_app is not app
+    assert worker_app.config['EXPORT_TEST_SETTING'] == 'from-parent'
+    assert worker_app.config['MONGO_DB_NAME'] == app.config['MONGO_DB_NAME']
+    assert static_export._worker_version == 1
@@ -0,0 +1,68 @@
+import pytest
+
+from pokedex_app.app.utils.team_analysis import analyze_team, analyze_teams
+from pokedex_app.app.utils.type_chart import type_chart
+
+PIKACHU, CHARIZARD, GYARADOS = 25, 6, 130
+GROWL, FLAMETHROWER, THUNDERBOLT, EARTHQUAKE = 45, 53, 85, 89
+
+
+@pytest.fixture(autouse=True)
+def app_context(app):
+    # The analysis reads the snapshot and type chart loaded by create_app
+    with app.app_context():
+        yield
+
+
+def test_dual_type_multipliers():
+    multipliers = type_chart.multipliers(['Fire', 'Flying'])
+
+    assert multipliers['Rock'] == 4
+    assert multipliers['Ground'] == 0
+    assert multipliers['Grass'] == 0.25
+    assert multipliers['Water'] == 2
+
+
+def test_defense_counts_and_stacked_weaknesses():
+    analysis = analyze_team([CHARIZARD, GYARADOS])
+    defense = analysis['defense']
+
+    assert defense['weaknesses']['Rock'] == 2
+    assert defense['weaknesses']['Electric'] == 2
+    assert defense['immunities']['Ground'] == 2
+    assert set(defense['stacked_weaknesses']) >= {'Rock', 'Electric'}
+    assert [member['id'] for member in analysis['members']] == [CHARIZARD, GYARADOS]
+
+
+def test_offense_uses_damaging_moves_or_stab():
+    stab = analyze_team([{'id': PIKACHU, 'moves': [GROWL]}])['offense']
+    assert stab['source'] == 'stab'
+    assert stab['attacking_types'] == ['Electric']
+
+    moves = analyze_team([{'id': PIKACHU, 'moves': [THUNDERBOLT, GROWL]},
+                          {'id': CHARIZARD, 'moves': [{'id': FLAMETHROWER}, EARTHQUAKE]}])['offense']
+    assert moves['source'] == 'moves'
+    assert set(moves['attacking_types']) == {'Electric', 'Fire', 'Ground'}
+    assert {'Water', 'Flying', 'Steel', 'Rock'} <= set(moves['super_effective'])
+    assert 0 < moves['combo_coverage'] <= 1
+
+
+def test_unknown_members_are_reported():
+    analysis = analyze_team([PIKACHU, 99999, 'x'])
+
+    assert [member['id'] for member in analysis['members']] == [PIKACHU]
+    assert analysis['missing'] == [99999, 'x']
+
+
+def test_batch_matches_single_team_analysis():
+    teams = [[PIKACHU], [CHARIZARD, GYARADOS], [], [{'id': GYARADOS, 'moves': [EARTHQUAKE]}]]
+
+    assert analyze_teams(teams) == [analyze_team(team) for team in teams]
+
+
+def test_teams_analyze_endpoint(client):
+    single = client.post('/api/teams/analyze', json={'pokemon': [{'id': CHARIZARD}]})
+    batch = client.post('/api/teams/analyze', json={'teams': [{'pokemon': [CHARIZARD]}, {'pokemon': [PIKACHU]}]})
+
+    assert single.status_code == 200
+    assert batch.status_code == 200
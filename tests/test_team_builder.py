@@ -0,0 +1,17 @@
+from pokedex_app.app.routes import team_builder
+
+
+def test_selector_only_gets_the_fields_it_shows(client, monkeypatch):
+    rendered = {}
+
+    def render_template(template_name, **context):
+        rendered.update(context)
+        return ''
+
+    monkeypatch.setattr(team_builder, 'render_template', render_template)
+    assert client.get('/team-builder/').status_code == 200
+
+    pikachu = next(pokemon for pokemon in rendered['all_pokemon'] if pokemon['id'] == 25)
+    assert set(pikachu) == {'id', 'name', 'type', 'image'}
+    assert pikachu['image'] == {'sprite': pikachu['image']['sprite']}
+    assert pikachu['name']['english'] == 'Pikachu'
@@ -0,0 +1,57 @@
+import base64
+from datetime import datetime, timezone
+
+import pytest
+from bson.objectid import ObjectId
+
+from pokedex_app.app.models.team_store import _decode_cursor, _encode_cursor
+
+
+def test_team_cursor_round_trip():
+    team = {'created_at': datetime(2024, 5, 1, 8, 30, 15, 123000), '_id': ObjectId()}
+
+    created_at, team_id = _decode_cursor(_encode_cursor(team))
+
+    assert created_at == team['created_at'].replace(tzinfo=timezone.utc)
+    assert team_id == team['_id']
+
+
+@pytest.mark.parametrize('cursor', [
+    '', 'garbage', 'aWQ6MTI',
+    base64.urlsafe_b64encode(b'team:123:not-an-id').decode('ascii'),
+    base64.urlsafe_b64encode(b'id:123:' + str(ObjectId()).encode('ascii')).decode('ascii')
+])
+def test_malformed_team_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        _decode_cursor(cursor)
+
+
+def test_list_pages_through_every_team_newest_first(client):
+    teams = [{'name': f'Team {i}', 'pokemon': [{'id': i + 1}]} for i in range(7)]
+    response = client.post('/team-builder/save/bulk', json={'teams': teams})
+    assert response.status_code == 200
+    saved = response.get_json()['team_ids']
+
+    seen, after = [], None
+    while True:
+        url = '/team-builder/list?limit=3' + (f'&after={after}' if after else '')
+        page = client.get(url).get_json()
+        assert len(page['teams']) <= 3
+        seen += [team['_id'] for team in page['teams']]
+        after = page['pagination']['next_cursor']
+        if after is None:
+            break
+
+    # Saved in one batch, so they share created_at and _id breaks the tie
+    assert seen == list(reversed(saved))
+
+
+def test_list_only_shows_the_visitors_teams(app, client):
+    client.post('/team-builder/save/bulk', json={'teams': [{'pokemon': [{'id': 1}]}]})
+
+    other = app.test_client()
+    assert other.get('/team-builder/list').get_json()['teams'] == []
+
+
+def test_list_rejects_a_malformed_cursor(client):
+    assert client.get('/team-builder/list?after=garbage').status_code == 400